@@ -16,7 +16,8 @@
 import serial
 import serial.tools.list_ports
 import time
-import pandas as pd
+import os
+import csv
 import re
 import numpy as np
 import matplotlib.pyplot as plt
@@ -24,10 +25,68 @@ import matplotlib.gridspec as gridspec
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import tkinter as tk
 from tkinter import scrolledtext, ttk, messagebox
+import sys
 import threading
 import queue
 import collections
-import statistics # Used for oscillation detection
+import math
+
+# =================================================================================
+# RingBuffer Class (fixed-size live plot history)
+# =================================================================================
+class RingBuffer:
+    """
+    Fixed-capacity float history backed by a NumPy array. Tracks the min/max of its
+    contents incrementally so plot limits can be set without relim()/autoscale_view().
+    """
+    def __init__(self, maxlen):
+        self.maxlen = maxlen
+        self._data = np.full(maxlen, np.nan)
+        self._head = 0 # Next write position
+        self._count = 0
+        self.y_min, self.y_max = np.nan, np.nan
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0: index += self._count
+        if not 0 <= index < self._count: raise IndexError("RingBuffer index out of range")
+        return self._data[(self._head - self._count + index) % self.maxlen]
+
+    def append(self, value):
+        value = np.nan if value is None else float(value)
+        evicted = self._data[self._head] if self._count == self.maxlen else np.nan
+        self._data[self._head] = value
+        self._head = (self._head + 1) % self.maxlen
+        if self._count < self.maxlen: self._count += 1
+
+        # O(1) unless the evicted sample was holding one of the extremes.
+        if evicted == self.y_min or evicted == self.y_max:
+            self._rescan_limits()
+        elif not np.isnan(value):
+            if np.isnan(self.y_min) or value < self.y_min: self.y_min = value
+            if np.isnan(self.y_max) or value > self.y_max: self.y_max = value
+
+    def _rescan_limits(self):
+        data = self.view()
+        if np.isnan(data).all():
+            self.y_min, self.y_max = np.nan, np.nan
+        else:
+            self.y_min, self.y_max = np.nanmin(data), np.nanmax(data)
+
+    def view(self):
+        """Returns the contents in chronological order (no copy until the buffer wraps)."""
+        if self._count < self.maxlen:
+            return self._data[:self._count]
+        if self._head == 0:
+            return self._data
+        return np.concatenate((self._data[self._head:], self._data[:self._head]))
+
+    def clear(self):
+        self._data.fill(np.nan)
+        self._head, self._count = 0, 0
+        self.y_min, self.y_max = np.nan, np.nan
 
 # =================================================================================
 # DAQController Class (for Multi-Channel RP2040)
@@ -37,12 +96,28 @@ class DAQController:
     def __init__(self, port):
         try:
             self.ser = serial.Serial(port, 9600, timeout=2)
+            self._set_low_latency()
             time.sleep(2)
             self.is_connected = True
             self.voltage_history = {i: collections.deque(maxlen=5) for i in range(4)}
         except serial.SerialException as e:
             raise ConnectionError(f"Failed to open DAQ port {port}: {e}")
 
+    def _set_low_latency(self):
+        """Best effort: shortens the driver-side latency of each R<ch> round trip."""
+        try:
+            if sys.platform.startswith('linux'):
+                import fcntl, array
+                TIOCGSERIAL, TIOCSSERIAL, ASYNC_LOW_LATENCY = 0x541E, 0x541F, 0x2000
+                buf = array.array('i', [0] * 32) # struct serial_struct; flags is the 5th int
+                fcntl.ioctl(self.ser.fileno(), TIOCGSERIAL, buf)
+                buf[4] |= ASYNC_LOW_LATENCY
+                fcntl.ioctl(self.ser.fileno(), TIOCSSERIAL, buf)
+            elif sys.platform == 'win32':
+                self.ser.set_buffer_size(rx_size=4096, tx_size=4096)
+        except (OSError, AttributeError, ValueError):
+            pass # Not every driver (e.g. CDC-ACM) supports this; the defaults still work.
+
     def read_voltage(self, channel):
         if not self.is_connected: return None
         try:
@@ -87,7 +162,12 @@ class StateMachinePressureController:
             self.previous_setpoint = 0.0 # Track the last setpoint for safety delay
 
             # For oscillation detection
-            self.pressure_history = collections.deque(maxlen=10)
+            self.pressure_history = RingBuffer(10)
+            # Running moments of pressure_history, published as one tuple so readers
+            # on other threads never see a half-updated (shift, n, sum, sum_sq).
+            # Sums are taken about the shift to avoid cancellation at high pressures.
+            self._moments = (0.0, 0, 0.0, 0.0)
+            self._history_lock = threading.Lock() # Serialises recording against clearing
             self.stability_threshold = 0.05 # Torr. If std dev is above this, it's oscillating.
             
             self.is_connected = True
@@ -139,10 +219,37 @@ class StateMachinePressureController:
             pressure = self.get_pressure()
             if pressure is not None:
                 self.current_pressure = pressure
-                self.pressure_history.append(self.current_pressure)
+                self._record_pressure(pressure)
             self.get_valve_positions()
             time.sleep(0.2)
         
+    def _record_pressure(self, pressure):
+        """Appends to pressure_history and updates the running moments in O(1)."""
+        with self._history_lock:
+            hist = self.pressure_history
+            if len(hist) == 0: # Fresh window (set_pressure clears it): restart the sums
+                shift, s1, s2 = pressure, 0.0, 0.0
+            else:
+                shift, _, s1, s2 = self._moments
+                if len(hist) == hist.maxlen:
+                    old = hist[0] - shift
+                    s1 -= old; s2 -= old * old
+            hist.append(pressure)
+            d = pressure - shift
+            self._moments = (shift, len(hist), s1 + d, s2 + d * d)
+
+    def _clear_pressure_history(self):
+        """Empties pressure_history and resets its moments together."""
+        with self._history_lock:
+            self.pressure_history.clear()
+            self._moments = (0.0, 0, 0.0, 0.0)
+
+    def stdev(self):
+        """Sample standard deviation of pressure_history, or inf with fewer than 2 samples."""
+        _, n, s1, s2 = self._moments
+        if n < 2: return float('inf')
+        return math.sqrt(max(s2 - s1 * s1 / n, 0.0) / (n - 1))
+
     def _run_adaptive_outlet_loop(self):
         """This slow loop makes intelligent adjustments to the outlet valve."""
         while not self._stop_event.is_set():
@@ -162,7 +269,7 @@ class StateMachinePressureController:
                 else:
                     min_clamp, max_clamp = 24.0, 35.0 # Low pressure, more pumping needed
 
-                std_dev = statistics.stdev(self.pressure_history)
+                std_dev = self.stdev()
                 is_oscillating = std_dev > self.stability_threshold
                 
                 current_pos = self.outlet_valve_pos
@@ -197,7 +304,7 @@ class StateMachinePressureController:
                     self._write_command(self.ser_outlet, f"S1 {clamped_pos:.2f}")
                     self._write_command(self.ser_outlet, "D1")
 
-            except statistics.StatisticsError:
+            except ValueError:
                 pass
             
             time.sleep(1.0)
@@ -209,7 +316,7 @@ class StateMachinePressureController:
         self.log_queue.put(f">> New system setpoint: {pressure:.3f} Torr")
         self.previous_setpoint = self.system_setpoint
         self.system_setpoint = pressure
-        self.pressure_history.clear()
+        self._clear_pressure_history()
         self.outlet_floor_pos = 22.0 # Reset the valve floor for the new setpoint.
 
         if pressure == 0:
@@ -266,6 +373,38 @@ class StateMachinePressureController:
             if self.ser_outlet and self.ser_outlet.is_open: self.ser_outlet.close()
             self.is_connected = False
         
+# =================================================================================
+# Analysis Helpers
+# =================================================================================
+def _linfit(x, y):
+    """
+    Closed-form least-squares line y = slope*x + intercept (same result as np.polyfit(x, y, 1)).
+    y may be 2-D (N, k) to fit k columns against the same x in one pass.
+    """
+    xm, ym = x.mean(), y.mean(axis=0)
+    dx = x - xm
+    slope = (dx @ (y - ym)) / (dx @ dx)
+    return slope, ym - slope * xm
+
+def _nearest_index(x, target):
+    """Index of the element of x closest to target; binary search when x is an ascending sweep."""
+    if len(x) > 1 and np.all(x[1:] >= x[:-1]):
+        i = min(max(int(np.searchsorted(x, target)), 1), len(x) - 1)
+        nearest = x[i - 1] if abs(target - x[i - 1]) <= abs(x[i] - target) else x[i]
+        return int(np.searchsorted(x, nearest)) # First occurrence, matching argmin on ties
+    return int(np.argmin(np.abs(x - target)))
+
+def _diagnose(std, dut, fs, slope, intercept):
+    """
+    Zero/span/linearity checks for one DUT's fitted line. Works on plain floats: the handful of
+    scalar ops here is cheaper than NumPy scalar dispatch (and than JIT-compiling a kernel for it).
+    """
+    slope, intercept = float(slope), float(intercept)
+    mid_idx = _nearest_index(std, fs * 0.5)
+    mid_err = float(dut[mid_idx]) - (slope * float(std[mid_idx]) + intercept)
+    return (slope, intercept, mid_err,
+            abs(intercept) > (fs * 0.001), abs(1.0 - slope) > 0.005, abs(mid_err) > (fs * 0.002))
+
 # =================================================================================
 # Main GUI Class
 # =================================================================================
@@ -286,16 +425,23 @@ class CalibrationGUI(tk.Tk):
         self.dut_colors = ['#2ca02c', '#d62728', '#9467bd', '#8c564b']
         
         self.data_storage = {}
+        self.n_samples = 0 # Rows of data_storage filled so far
+        self._tune_cache_key, self._tune_cache_val = None, None
+        self._valid_pairs_key, self._valid_pairs = None, {}
+        self.results_csv = "calibration_results.csv"
+        self.csv_file = None
         self.log_queue = queue.Queue()
+        self._com_ports_q = queue.Queue() # Port lists from the COM scan thread, applied on the Tk loop
         
         self.manual_focus_device = tk.StringVar(value="std")
         self.manual_focus_channel = None
 
-        self.live_time_history = collections.deque(maxlen=500)
-        self.live_inlet_valve_history = collections.deque(maxlen=500)
-        self.live_outlet_valve_history = collections.deque(maxlen=500)
-        self.live_std_pressure_history = collections.deque(maxlen=500)
-        self.live_dut_pressure_history = {i: collections.deque(maxlen=500) for i in range(4)}
+        self.live_time_history = RingBuffer(500)
+        self.live_inlet_valve_history = RingBuffer(500)
+        self.live_outlet_valve_history = RingBuffer(500)
+        self.live_std_pressure_history = RingBuffer(500)
+        self.live_dut_pressure_history = {i: RingBuffer(500) for i in range(4)}
+        self._active_mask = [False] * 4 # Per-channel DUT enable, fixed at connect time
 
         self.manual_trace_time = collections.deque(maxlen=100)
         self.manual_trace_std = collections.deque(maxlen=100)
@@ -303,7 +449,11 @@ class CalibrationGUI(tk.Tk):
         
         self.setup_ui()
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
-        self.after(100, self.periodic_update)
+        # Three cadences: snappy log output, 5 Hz sampling, 1 Hz redraw of the main plots.
+        self.after(100, self._drain_logs)
+        self.after(200, self._sample_tick)
+        self.after(1000, self._plot_tick)
+        self.after_idle(self._refresh_ports) # Enumerate once the main loop is running
 
     def setup_ui(self):
         top_config_frame = tk.Frame(self)
@@ -313,19 +463,18 @@ class CalibrationGUI(tk.Tk):
         config_frame = tk.LabelFrame(top_config_frame, text="Configuration", padx=10, pady=10)
         config_frame.grid(row=0, column=0, sticky="nsew", padx=(0, 5))
         
-        com_ports = [port.device for port in serial.tools.list_ports.comports()]
         valid_ranges = sorted([0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0, 500.0, 1000.0])
 
         tk.Label(config_frame, text="Inlet Controller (Inverse):").grid(row=0, column=0, sticky="w", columnspan=2)
         tk.Label(config_frame, text="COM Port:").grid(row=1, column=0, sticky="e", padx=5)
         self.inlet_com_var = tk.StringVar(self, value="COM9")
-        self.inlet_com_combo = ttk.Combobox(config_frame, textvariable=self.inlet_com_var, values=com_ports, width=10)
+        self.inlet_com_combo = ttk.Combobox(config_frame, textvariable=self.inlet_com_var, values=[], width=10)
         self.inlet_com_combo.grid(row=1, column=1, sticky="w")
         
         tk.Label(config_frame, text="Outlet Controller (Direct):").grid(row=2, column=0, sticky="w", pady=(8,0), columnspan=2)
         tk.Label(config_frame, text="COM Port:").grid(row=3, column=0, sticky="e", padx=5)
         self.outlet_com_var = tk.StringVar(self, value="COM8")
-        self.outlet_com_combo = ttk.Combobox(config_frame, textvariable=self.outlet_com_var, values=com_ports, width=10)
+        self.outlet_com_combo = ttk.Combobox(config_frame, textvariable=self.outlet_com_var, values=[], width=10)
         self.outlet_com_combo.grid(row=3, column=1, sticky="w")
 
         tk.Label(config_frame, text="System FS (Torr):").grid(row=4, column=0, sticky="e", padx=5, pady=(8,0))
@@ -336,7 +485,7 @@ class CalibrationGUI(tk.Tk):
         tk.Label(config_frame, text="DAQ (RP2040):").grid(row=5, column=0, sticky="w", pady=(10,0), columnspan=2)
         tk.Label(config_frame, text="COM Port:").grid(row=6, column=0, sticky="e", padx=5)
         self.daq_com_var = tk.StringVar(self, value="COM12")
-        self.daq_com_combo = ttk.Combobox(config_frame, textvariable=self.daq_com_var, values=com_ports, width=10)
+        self.daq_com_combo = ttk.Combobox(config_frame, textvariable=self.daq_com_var, values=[], width=10)
         self.daq_com_combo.grid(row=6, column=1, sticky="w")
 
         dut_frame = tk.LabelFrame(top_config_frame, text="Devices Under Test (DUTs)", padx=10, pady=10)
@@ -364,7 +513,8 @@ class CalibrationGUI(tk.Tk):
         self.ax_cal = self.fig.add_subplot(gs[0, :])
         self.ax_live_pressure = self.fig.add_subplot(gs[1, 0])
         self.ax_live_valves = self.fig.add_subplot(gs[1, 1])
-        self.fig.tight_layout(pad=3.0)
+        # Fixed subplot params instead of tight_layout(): the layout engine never re-runs on redraw.
+        self.fig.subplots_adjust(left=0.08, right=0.97, top=0.95, bottom=0.08, hspace=0.35, wspace=0.25)
 
         self.canvas = FigureCanvasTkAgg(self.fig, master=self.plot_term_frame)
         self.canvas.get_tk_widget().grid(row=0, column=0, sticky="nsew")
@@ -394,6 +544,23 @@ class CalibrationGUI(tk.Tk):
         self.e_stop_button = tk.Button(action_frame, text="E-Stop", command=self.e_stop_action, bg="red", fg="white", state=tk.DISABLED, width=15)
         self.e_stop_button.pack(side=tk.LEFT, padx=5)
 
+    def _refresh_ports(self):
+        # Port enumeration can be slow on Windows: scan on a thread, fill the combos once it finishes.
+        def scan():
+            self._com_ports_q.put([port.device for port in serial.tools.list_ports.comports()])
+        threading.Thread(target=scan, daemon=True).start()
+        self.after(50, self._poll_ports)
+
+    def _poll_ports(self):
+        # The scan thread only fills the queue; Tk calls stay on the main thread.
+        try:
+            com_ports = self._com_ports_q.get_nowait()
+        except queue.Empty:
+            self.after(50, self._poll_ports)
+            return
+        for combo in (self.inlet_com_combo, self.outlet_com_combo, self.daq_com_combo):
+            combo.config(values=com_ports)
+
     def send_manual_command(self, event=None):
         command = self.command_entry.get().strip()
         self.command_entry.delete(0, tk.END)
@@ -460,14 +627,22 @@ class CalibrationGUI(tk.Tk):
         for dut in self.active_duts: max_fs = max(max_fs, dut['fs'])
         self.ax_cal.set_xlim([0, max_fs*1.05]); self.ax_cal.set_ylim([0, max_fs*1.05])
         self.ax_cal.plot([0, max_fs], [0, max_fs], 'k--', alpha=0.5, label='Ideal 1:1 Line')
+        self.cal_dut_lines = {}
+        for dut in self.active_duts:
+            ch = dut['channel']
+            line, = self.ax_cal.plot([], [], 'o-', label=f'Device {ch+1}', color=self.dut_colors[ch])
+            self.cal_dut_lines[ch] = line
+        self.ax_cal.legend()
         
         # --- Live Pressure Plot (Bottom Left) ---
         self.ax_live_pressure.set_title("Live Pressure"); self.ax_live_pressure.set_xlabel("Time (s)")
         self.ax_live_pressure.set_ylabel("Pressure (Torr)"); self.ax_live_pressure.grid(True, linestyle=':')
         self.live_std_plot, = self.ax_live_pressure.plot([], [], 'blue', linewidth=2, label='Standard')
+        self._active_mask = [any(d['channel'] == i for d in self.active_duts) for i in range(4)]
         self.live_dut_plots = {}
         for i in range(4):
             line, = self.ax_live_pressure.plot([], [], color=self.dut_colors[i], label=f'DUT {i+1}')
+            line.set_visible(self._active_mask[i]) # Inactive channels are never sampled or redrawn
             self.live_dut_plots[i] = line
         self.ax_live_pressure.legend(loc='upper left')
 
@@ -479,79 +654,126 @@ class CalibrationGUI(tk.Tk):
         self.live_outlet_valve_plot, = self.ax_live_valves.plot([], [], color='red', linestyle=':', label='Outlet Valve')
         self.ax_live_valves.legend(loc='upper left')
 
+        # Limits are managed explicitly from here on; static furniture is never rebuilt.
+        for ax in (self.ax_cal, self.ax_live_pressure, self.ax_live_valves):
+            ax.set_autoscale_on(False)
+
         self.canvas.draw_idle()
 
     def log_message(self, message):
         self.log_queue.put(message)
 
-    def periodic_update(self):
+    def _drain_logs(self):
         while not self.log_queue.empty():
             msg = self.log_queue.get()
             self.terminal_text.config(state=tk.NORMAL); self.terminal_text.insert(tk.END, f"\n{msg}"); self.terminal_text.see(tk.END); self.terminal_text.config(state=tk.DISABLED)
-        
+        self.after(100, self._drain_logs)
+
+    def _sample_tick(self):
+        """Samples the controller and DAQ into the live histories and refreshes the manual display."""
+        # Hot path (5 Hz, forever): bind the attribute chains to locals once per tick.
+        sc = self.state_controller
+        ldph = self.live_dut_pressure_history
+        active_duts = self.active_duts
         if self.is_in_manual_mode and hasattr(self, 'manual_labels'):
-            std_pressure = self.state_controller.current_pressure if self.state_controller else None
+            std_pressure = sc.current_pressure if sc else None
             if std_pressure is not None:
-                for dut in self.active_duts:
+                labels, last_diff, last_fill = self.manual_labels, self._last_diff, self._last_fill
+                for dut in active_duts:
                     ch, fs = dut['channel'], dut['fs']
-                    dut_pressure = self.live_dut_pressure_history[ch][-1] if self.live_dut_pressure_history[ch] else None
+                    dut_pressure = ldph[ch][-1] if ldph[ch] else None
                     if dut_pressure is not None:
                         diff = dut_pressure - std_pressure
-                        self.manual_labels[ch]['diff_var'].set(f"Diff: {diff:+.3f} Torr")
+                        # Only touch Tk when the displayed value actually changes.
+                        diff_key = round(diff, 3)
+                        if diff_key != last_diff[ch]:
+                            last_diff[ch] = diff_key
+                            labels[ch]['diff_var'].set(f"Diff: {diff:+.3f} Torr")
                         
+                        abs_diff = abs(diff)
                         inner_tolerance = fs * 0.002
                         outer_tolerance = inner_tolerance * 5
                         fill_percent = 0.0
-                        if abs(diff) <= inner_tolerance: fill_percent = 100.0
-                        elif abs(diff) < outer_tolerance: fill_percent = 100.0 * (1.0 - (abs(diff) - inner_tolerance) / (outer_tolerance - inner_tolerance))
-                        self.manual_labels[ch]['progress']['value'] = fill_percent
-
-            if self.manual_focus_channel is not None:
-                self.manual_trace_time.append((self.live_time_history[-1] if self.live_time_history else 0))
+                        if abs_diff <= inner_tolerance: fill_percent = 100.0
+                        elif abs_diff < outer_tolerance: fill_percent = 100.0 * (1.0 - (abs_diff - inner_tolerance) / (outer_tolerance - inner_tolerance))
+                        if abs(fill_percent - last_fill[ch]) > 0.5:
+                            last_fill[ch] = fill_percent
+                            labels[ch]['progress']['value'] = fill_percent
+
+            focus = self.manual_focus_channel
+            if focus is not None:
+                ax, mcanvas = self.ax_manual_trace, self.manual_canvas
+                std_line, dut_line = self.manual_std_line, self.manual_dut_line
+                trace_time = self.manual_trace_time
+                trace_time.append((self.live_time_history[-1] if self.live_time_history else 0))
                 self.manual_trace_std.append(std_pressure)
-                self.manual_trace_dut.append(self.live_dut_pressure_history[self.manual_focus_channel][-1] if self.live_dut_pressure_history[self.manual_focus_channel] else None)
-                self.manual_std_line.set_data(self.manual_trace_time, self.manual_trace_std)
-                self.manual_dut_line.set_data(self.manual_trace_time, self.manual_trace_dut)
-                t_max = self.manual_trace_time[-1] if self.manual_trace_time else 0
-                self.ax_manual_trace.set_xlim(max(0, t_max - 20), t_max + 1)
-                self.ax_manual_trace.relim(); self.ax_manual_trace.autoscale_view(scaley=True)
-                self.manual_canvas.draw_idle()
-
-        if self.state_controller and self.state_controller.is_connected:
+                self.manual_trace_dut.append(ldph[focus][-1] if ldph[focus] else None)
+                std_line.set_data(trace_time, self.manual_trace_std)
+                dut_line.set_data(trace_time, self.manual_trace_dut)
+                t_max = trace_time[-1] if trace_time else 0
+                x_right = int(t_max) + 2
+                if x_right > ax.get_xlim()[1]:
+                    # Window advanced past its edge: full redraw (about once per second) refreshes the background.
+                    ax.set_xlim(max(0, x_right - 21), x_right)
+                    mcanvas.draw()
+                if self._manual_trace_bg is not None:
+                    mcanvas.restore_region(self._manual_trace_bg)
+                    ax.draw_artist(std_line)
+                    ax.draw_artist(dut_line)
+                    mcanvas.blit(ax.bbox)
+
+        if sc and sc.is_connected:
+            daq = self.daq
             current_time = time.time() - self.start_time
             self.live_time_history.append(current_time)
-            self.live_inlet_valve_history.append(self.state_controller.inlet_valve_pos)
-            self.live_outlet_valve_history.append(self.state_controller.outlet_valve_pos)
-            self.live_std_pressure_history.append(self.state_controller.current_pressure)
+            self.live_inlet_valve_history.append(sc.inlet_valve_pos)
+            self.live_outlet_valve_history.append(sc.outlet_valve_pos)
+            self.live_std_pressure_history.append(sc.current_pressure)
             
-            for i in range(4):
-                is_active = any(d['channel'] == i for d in self.active_duts)
-                if is_active:
-                    voltage = self.daq.read_voltage(i) if self.daq else None
-                    fs = [d['fs'] for d in self.active_duts if d['channel'] == i][0]
-                    dut_pressure = voltage * (fs / 9.9) if voltage is not None else np.nan
-                    self.live_dut_pressure_history[i].append(dut_pressure)
-                else:
-                    self.live_dut_pressure_history[i].append(np.nan)
-
-            self.live_inlet_valve_plot.set_data(self.live_time_history, self.live_inlet_valve_history)
-            self.live_outlet_valve_plot.set_data(self.live_time_history, self.live_outlet_valve_history)
-            self.live_std_plot.set_data(self.live_time_history, self.live_std_pressure_history)
+            # Only enabled channels are read and recorded; the rest keep empty histories.
+            for dut in active_duts:
+                ch, fs = dut['channel'], dut['fs']
+                voltage = daq.read_voltage(ch) if daq else None
+                dut_pressure = voltage * (fs / 9.9) if voltage is not None else np.nan
+                ldph[ch].append(dut_pressure)
+
+        self.after(200, self._sample_tick)
+
+    def _plot_tick(self):
+        """Pushes the sampled histories to the main live plots; the expensive draw runs at 1 Hz."""
+        sc = self.state_controller
+        if sc and sc.is_connected:
+            ldph = self.live_dut_pressure_history
+            lp, lv = self.ax_live_pressure, self.ax_live_valves
+            std_hist, time_hist = self.live_std_pressure_history, self.live_time_history
+            active_mask = self._active_mask
+
+            t_view = time_hist.view()
+            self.live_inlet_valve_plot.set_data(t_view, self.live_inlet_valve_history.view())
+            self.live_outlet_valve_plot.set_data(t_view, self.live_outlet_valve_history.view())
+            self.live_std_plot.set_data(t_view, std_hist.view())
             
+            y_buffers = [std_hist]
             for i, line in self.live_dut_plots.items():
-                line.set_visible(any(d['channel'] == i for d in self.active_duts))
-                line.set_data(self.live_time_history, self.live_dut_pressure_history[i])
+                if active_mask[i]:
+                    line.set_data(t_view, ldph[i].view())
+                    y_buffers.append(ldph[i])
             
-            t_max = self.live_time_history[-1] if self.live_time_history else 0
-            self.ax_live_pressure.set_xlim(max(0, t_max - 90), t_max + 1)
-            self.ax_live_valves.set_xlim(max(0, t_max - 90), t_max + 1)
-            self.ax_live_pressure.relim(); self.ax_live_pressure.autoscale_view(scaley=True)
-            self.ax_live_valves.relim(); self.ax_live_valves.autoscale_view(scaley=True)
-            self.ax_live_valves.set_ylim([-5, 105]) # Re-apply fixed y-limit for valves
+            t_max = time_hist[-1] if time_hist else 0
+            lp.set_xlim(max(0, t_max - 90), t_max + 1)
+            lv.set_xlim(max(0, t_max - 90), t_max + 1)
+
+            # Y-limits come from the buffers' running extremes instead of relim()/autoscale_view().
+            y_mins = [buf.y_min for buf in y_buffers if not np.isnan(buf.y_min)]
+            y_maxs = [buf.y_max for buf in y_buffers if not np.isnan(buf.y_max)]
+            if y_mins:
+                y_lo, y_hi = min(y_mins), max(y_maxs)
+                pad = (y_hi - y_lo) * 0.05 or max(abs(y_hi) * 0.05, 0.01)
+                lp.set_ylim(y_lo - pad, y_hi + pad)
 
             self.canvas.draw_idle()
         
-        self.after(200, self.periodic_update)
+        self.after(1000, self._plot_tick)
 
     def toggle_manual_mode(self):
         self.is_in_manual_mode = not self.is_in_manual_mode
@@ -594,6 +816,8 @@ class CalibrationGUI(tk.Tk):
         tk.Button(button_frame, text="Set 100% FS", command=lambda: self.set_manual_pressure(1.0)).pack(side=tk.LEFT, padx=5)
 
         self.manual_labels = {}
+        self._last_diff = {dut['channel']: None for dut in self.active_duts}
+        self._last_fill = {dut['channel']: -1.0 for dut in self.active_duts}
         self.manual_focus_device.set("std")
 
         device_list_frame = tk.LabelFrame(left_panel, text="Focus Control", padx=10, pady=10)
@@ -621,15 +845,18 @@ class CalibrationGUI(tk.Tk):
         self.manual_plot_panel.grid(row=0, column=1, sticky="nsew", padx=10, pady=10)
 
         self.manual_fig, self.ax_manual_trace = plt.subplots(figsize=(8, 6))
+        self.manual_fig.subplots_adjust(left=0.12, right=0.96, top=0.92, bottom=0.1)
         self.ax_manual_trace.set_title("Live Trace: DUT vs. Standard")
         self.ax_manual_trace.set_xlabel("Time (s)"); self.ax_manual_trace.set_ylabel("Pressure (Torr)")
         self.ax_manual_trace.grid(True)
-        self.manual_std_line, = self.ax_manual_trace.plot([], [], 'b-', label='Standard')
-        self.manual_dut_line, = self.ax_manual_trace.plot([], [], 'g-', label='Focused DUT', linewidth=2)
+        self.manual_std_line, = self.ax_manual_trace.plot([], [], 'b-', label='Standard', animated=True)
+        self.manual_dut_line, = self.ax_manual_trace.plot([], [], 'g-', label='Focused DUT', linewidth=2, animated=True)
         self.ax_manual_trace.legend()
         
         self.manual_canvas = FigureCanvasTkAgg(self.manual_fig, master=self.manual_plot_panel)
         self.manual_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
+        self._manual_trace_bg = None
+        self.manual_canvas.mpl_connect('draw_event', self._cache_manual_trace_bg)
         
         self.on_manual_focus_change()
 
@@ -648,7 +875,15 @@ class CalibrationGUI(tk.Tk):
             self.manual_trace_time.clear(); self.manual_trace_std.clear(); self.manual_trace_dut.clear()
             if hasattr(self, 'manual_plot_panel'):
                 self.ax_manual_trace.set_title(f"Live Trace: DUT {ch+1} vs. Standard")
+                # Fixed y-range for the focused DUT so the trace can be blitted without rescaling.
+                self.ax_manual_trace.set_ylim(-fs * 0.05, fs * 1.05)
+                self.ax_manual_trace.set_xlim(0, 21)
                 self.manual_plot_panel.grid()
+                self.manual_canvas.draw()
+
+    def _cache_manual_trace_bg(self, event=None):
+        # Animated lines are skipped by a full draw, so this captures a clean background to blit onto.
+        self._manual_trace_bg = self.manual_canvas.copy_from_bbox(self.ax_manual_trace.bbox)
 
     def set_manual_pressure(self, fs_fraction):
         focus_id = self.manual_focus_device.get()
@@ -668,11 +903,25 @@ class CalibrationGUI(tk.Tk):
         self.canvas.get_tk_widget().grid()
     
     def start_calibration_thread(self):
+        columns = ['Setpoint_Torr', 'Standard_Pressure_Torr'] + [f'Device_{dut["channel"]+1}_Pressure_Torr' for dut in self.active_duts]
+        # Results are streamed one row per setpoint to a .partial file so an E-Stop or crash keeps what was logged;
+        # it only replaces results_csv once the run completes.
+        try:
+            self.csv_file = open(self.results_csv + ".partial", 'w', newline='')
+        except OSError as e: # Typically the file is still open in Excel
+            self.log_message(f"ERROR: Could not open results file: {e}")
+            return
+        self.csv_writer = csv.DictWriter(self.csv_file, fieldnames=columns)
+        self.csv_writer.writeheader()
+
         self.is_calibrating = True
         self.log_message("\n--- Starting Automated Data Logging ---")
-        self.data_storage = {'Setpoint_Torr': [], 'Standard_Pressure_Torr': []}
-        for dut in self.active_duts:
-            self.data_storage[f'Device_{dut["channel"]+1}_Pressure_Torr'] = []
+        # One preallocated column per quantity; at most 11 setpoints per full scale (standard + each DUT).
+        max_samples = 11 * (1 + len(self.active_duts))
+        self.data_storage = {key: np.full(max_samples, np.nan) for key in columns}
+        self.n_samples = 0
+        self._tune_cache_key, self._tune_cache_val = None, None # New run, new data
+        self._valid_pairs_key, self._valid_pairs = None, {}
         
         self.start_button.config(state=tk.DISABLED); self.manual_cal_button.config(state=tk.DISABLED)
         self.e_stop_button.config(state=tk.NORMAL)
@@ -680,17 +929,18 @@ class CalibrationGUI(tk.Tk):
 
     def run_calibration(self):
         try:
-            master_setpoints = set()
-            for i in range(0, 101, 10): master_setpoints.add(round(self.standard_fs_value * i / 100, 2))
-            for dut in self.active_duts:
-                for i in range(0, 101, 10): master_setpoints.add(round(dut['fs'] * i / 100, 2))
-            
-            setpoints = sorted(list(master_setpoints))
+            # One row of 0-100% (10% steps) setpoints per full scale: standard first, then each DUT.
+            fracs = np.arange(0, 101, 10) / 100.0
+            all_fs = np.array([self.standard_fs_value] + [d['fs'] for d in self.active_duts])
+            setpoint_grid = np.round(np.outer(all_fs, fracs), 2)
+
+            setpoints = np.unique(setpoint_grid).tolist()
             self.log_message(f"Generated composite setpoints: {setpoints}")
 
+            # Built from the same grid so the float membership tests below match exactly.
             dut_specific_setpoints = {
-                dut['channel']: {round(dut['fs'] * i / 100, 2) for i in range(0, 101, 10)}
-                for dut in self.active_duts
+                dut['channel']: set(setpoint_grid[row].tolist())
+                for row, dut in enumerate(self.active_duts, start=1)
             }
             
             for sp in setpoints:
@@ -707,21 +957,25 @@ class CalibrationGUI(tk.Tk):
                 relevant_duts = [d for d in self.active_duts if sp in dut_specific_setpoints[d['channel']]]
                 priority_tolerance = min([d['fs'] * 0.005 for d in relevant_duts]) if relevant_duts else self.standard_fs_value * 0.005
 
+                stability_threshold = self.standard_fs_value * 0.0002
                 while self.is_calibrating:
-                    if len(self.state_controller.pressure_history) < 10:
+                    # Snapshot the shared controller state once per pass.
+                    now = time.time()
+                    stable_pressure = self.state_controller.current_pressure
+                    hist_len = len(self.state_controller.pressure_history)
+                    if hist_len < 10:
                         time.sleep(0.5)
                         continue
 
-                    is_stable = statistics.stdev(self.state_controller.pressure_history) < (self.standard_fs_value * 0.0002)
-                    stable_pressure = self.state_controller.current_pressure
+                    is_stable = self.state_controller.stdev() < stability_threshold
                     
                     if is_stable:
                         is_in_tolerance = abs(stable_pressure - sp) <= priority_tolerance
 
                         if is_in_tolerance:
                             out_of_tolerance_start_time = None 
-                            if stability_confirmed_time is None: stability_confirmed_time = time.time()
-                            if (time.time() - stability_confirmed_time) >= 2.0:
+                            if stability_confirmed_time is None: stability_confirmed_time = now
+                            if (now - stability_confirmed_time) >= 2.0:
                                 self.log_message(f"  Pressure locked at {stable_pressure:.3f} Torr. Proceeding to log.")
                                 break
                         else:
@@ -729,8 +983,8 @@ class CalibrationGUI(tk.Tk):
                             if out_of_tolerance_start_time is None:
                                 self.log_message(f"  Pressure stable at {stable_pressure:.3f} Torr, but OUTSIDE tolerance (+/- {priority_tolerance:.4f} Torr).")
                                 self.log_message("  Waiting 10 seconds before prompting...")
-                                out_of_tolerance_start_time = time.time()
-                            elif (time.time() - out_of_tolerance_start_time) >= 10.0:
+                                out_of_tolerance_start_time = now
+                            elif (now - out_of_tolerance_start_time) >= 10.0:
                                 should_proceed = messagebox.askyesno("Out-of-Tolerance Override", 
                                     f"Pressure is stable at {stable_pressure:.4f} Torr, but outside tolerance ({sp:.4f} +/- {priority_tolerance:.4f} Torr).\n\nAccept this reading?")
                                 if should_proceed: break
@@ -761,14 +1015,17 @@ class CalibrationGUI(tk.Tk):
                 mean_standard = np.mean(standard_readings) if standard_readings else np.nan
                 if np.isnan(mean_standard): continue
 
-                self.data_storage['Setpoint_Torr'].append(sp)
-                self.data_storage['Standard_Pressure_Torr'].append(mean_standard)
+                row = self.n_samples
+                self.data_storage['Setpoint_Torr'][row] = sp
+                self.data_storage['Standard_Pressure_Torr'][row] = mean_standard
+                csv_row = {'Setpoint_Torr': sp, 'Standard_Pressure_Torr': mean_standard}
                 log_line = f"  Logged -> Setpoint: {sp:.2f} | Standard (Avg): {mean_standard:.3f} Torr"
 
                 for dut in self.active_duts:
                     ch, fs = dut['channel'], dut['fs']
                     mean_dut = np.mean(dut_readings.get(ch, [])) if dut_readings.get(ch) else np.nan
-                    self.data_storage[f'Device_{ch+1}_Pressure_Torr'].append(mean_dut)
+                    self.data_storage[f'Device_{ch+1}_Pressure_Torr'][row] = mean_dut
+                    csv_row[f'Device_{ch+1}_Pressure_Torr'] = '' if np.isnan(mean_dut) else mean_dut # Empty cell, as pandas wrote NaN
                     if not np.isnan(mean_dut):
                         log_line += f" | Dev {ch+1} (Avg): {mean_dut:.3f} Torr"
                         if sp in dut_specific_setpoints[ch]:
@@ -779,19 +1036,25 @@ class CalibrationGUI(tk.Tk):
                     else:
                         log_line += f" | Dev {ch+1}: READ FAILED"
 
+                self.n_samples = row + 1 # Publish the row only once every column is written
                 self.log_message(log_line)
+                self.csv_writer.writerow(csv_row)
+                self.csv_file.flush()
                 self.after(0, self.update_cal_plot)
             
             if self.is_calibrating:
-                self.log_message("\n--- Data Logging Complete. Saving data... ---")
-                df = pd.DataFrame(self.data_storage)
-                df.to_csv("calibration_results.csv", index=False)
-                self.log_message("Data saved to 'calibration_results.csv'.")
+                self.log_message("\n--- Data Logging Complete. ---")
+                self.csv_file.close()
+                os.replace(self.results_csv + ".partial", self.results_csv)
+                self.log_message(f"Data saved to '{self.results_csv}'.")
             
         except Exception as e:
             self.log_message(f"FATAL ERROR during logging: {e}")
         finally:
             self.is_calibrating = False
+            if self.csv_file is not None:
+                self.csv_file.close()
+                self.csv_file = None
             if self.state_controller: self.state_controller.close_valves()
             self.after(10, self.analyze_and_suggest_tuning)
             self.after(10, lambda: [
@@ -810,67 +1073,85 @@ class CalibrationGUI(tk.Tk):
         tk.Button(main_frame, text="Close", command=win.destroy).pack()
 
     def analyze_and_suggest_tuning(self):
+        # The fits only depend on the logged rows and the DUT set, so identical inputs reuse the last result.
+        key = (self.n_samples, tuple(d['channel'] for d in self.active_duts))
+        if key != self._tune_cache_key:
+            self._tune_cache_val = self._compute_tuning_suggestions()
+            self._tune_cache_key = key
+        final_suggestion_text, any_suggestions = self._tune_cache_val
+        self.log_message(final_suggestion_text)
+        if any_suggestions: self.show_tuning_suggestions_window(final_suggestion_text)
+
+    def _compute_tuning_suggestions(self):
         suggestion_parts = ["--- Post-Calibration Tuning Analysis ---"]
         any_suggestions = False
+        pairs = self._build_valid_pairs()
+
+        # Common case: every DUT read at every setpoint, so all columns share one x grid and one fit.
+        fits = {}
+        if pairs:
+            x0 = next(iter(pairs.values()))[0]
+            if len(x0) >= 3 and all(x is x0 or np.array_equal(x, x0) for x, _ in pairs.values()):
+                slopes, intercepts = _linfit(x0, np.column_stack([y for _, y in pairs.values()]))
+                fits = {ch: (slopes[k], intercepts[k]) for k, ch in enumerate(pairs)}
 
         for dut in self.active_duts:
             ch, fs = dut['channel'], dut['fs']
-            std_points = np.array([s for s, d in zip(self.data_storage['Standard_Pressure_Torr'], self.data_storage[f'Device_{ch+1}_Pressure_Torr']) if not np.isnan(d)])
-            dut_points = np.array([d for d in self.data_storage[f'Device_{ch+1}_Pressure_Torr'] if not np.isnan(d)])
+            std_points, dut_points = pairs[ch]
             if len(dut_points) < 3: continue
 
-            slope, intercept = np.polyfit(std_points, dut_points, 1)
-            zero_offset_is_sig = abs(intercept) > (fs * 0.001)
-            span_error_is_sig = abs(1.0 - slope) > 0.005
-            mid_idx = (np.abs(std_points - (fs * 0.5))).argmin()
-            midpoint_error_from_line = dut_points[mid_idx] - (slope * std_points[mid_idx] + intercept)
-            linearity_is_sig = abs(midpoint_error_from_line) > (fs * 0.002)
+            slope, intercept = fits[ch] if ch in fits else _linfit(std_points, dut_points)
+            slope, intercept, midpoint_error_from_line, zero_offset_is_sig, span_error_is_sig, linearity_is_sig = _diagnose(std_points, dut_points, fs, slope, intercept)
 
             if not (zero_offset_is_sig or span_error_is_sig or linearity_is_sig):
-                suggestion_parts.append(f"\n--- Analysis for DUT {ch+1} ({fs} Torr FS) ---")
-                suggestion_parts.append("  ✅ SUCCESS: Device is well-calibrated.")
+                suggestion_parts.append(f"\n--- Analysis for DUT {ch+1} ({fs} Torr FS) ---\n  ✅ SUCCESS: Device is well-calibrated.")
                 continue
 
+            # Assemble this DUT's block locally and add it to the report as one entry.
             any_suggestions = True
-            suggestion_parts.append(f"\n--- Suggestions for DUT {ch+1} ({fs} Torr FS) ---")
-            suggestion_parts.append(f"\n[ DIAGNOSIS ]\ny = {slope:.4f}x + {intercept:+.4f}")
-            if zero_offset_is_sig: suggestion_parts.append(f" • ZERO OFFSET ERROR: {intercept:+.4f} Torr.")
-            if span_error_is_sig: suggestion_parts.append(f" • SPAN (GAIN) ERROR: Gain is {'too high' if slope > 1 else 'too low'} (Slope={slope:.4f}).")
-            if linearity_is_sig: suggestion_parts.append(f" • LINEARITY ERROR: Mid-range response {'bows UP' if midpoint_error_from_line > 0 else 'bows DOWN'}.")
-
-            suggestion_parts.append("\n[ RECOMMENDED ADJUSTMENT PLAN ]")
-            suggestion_parts.append("\n1. ADJUST ZERO (0% FS)")
-            if zero_offset_is_sig: suggestion_parts.append(f"   ➡️ ACTION: Adjust to {'LOWER' if intercept > 0 else 'RAISE'} the reading.")
-            suggestion_parts.append("\n2. ADJUST SPAN (100% FS)")
-            if span_error_is_sig: suggestion_parts.append(f"   ➡️ ACTION: Adjust to {'LOWER' if slope > 1 else 'RAISE'} the reading.")
-            suggestion_parts.append("\n3. RE-CHECK ZERO (Critical Step)")
-            suggestion_parts.append("\n4. ADJUST LINEARITY (50% FS)")
-            if linearity_is_sig: suggestion_parts.append(f"   ➡️ ACTION: Correct {'upward \"smiling\"' if midpoint_error_from_line > 0 else 'downward \"frowning\"'} bow.")
+            parts = [f"\n--- Suggestions for DUT {ch+1} ({fs} Torr FS) ---", f"\n[ DIAGNOSIS ]\ny = {slope:.4f}x + {intercept:+.4f}"]
+            add = parts.append
+            if zero_offset_is_sig: add(f" • ZERO OFFSET ERROR: {intercept:+.4f} Torr.")
+            if span_error_is_sig: add(f" • SPAN (GAIN) ERROR: Gain is {'too high' if slope > 1 else 'too low'} (Slope={slope:.4f}).")
+            if linearity_is_sig: add(f" • LINEARITY ERROR: Mid-range response {'bows UP' if midpoint_error_from_line > 0 else 'bows DOWN'}.")
+
+            add("\n[ RECOMMENDED ADJUSTMENT PLAN ]")
+            add("\n1. ADJUST ZERO (0% FS)")
+            if zero_offset_is_sig: add(f"   ➡️ ACTION: Adjust to {'LOWER' if intercept > 0 else 'RAISE'} the reading.")
+            add("\n2. ADJUST SPAN (100% FS)")
+            if span_error_is_sig: add(f"   ➡️ ACTION: Adjust to {'LOWER' if slope > 1 else 'RAISE'} the reading.")
+            add("\n3. RE-CHECK ZERO (Critical Step)")
+            add("\n4. ADJUST LINEARITY (50% FS)")
+            if linearity_is_sig: add(f"   ➡️ ACTION: Correct {'upward \"smiling\"' if midpoint_error_from_line > 0 else 'downward \"frowning\"'} bow.")
+            suggestion_parts.append("\n".join(parts))
         
-        final_suggestion_text = "\n".join(suggestion_parts)
-        self.log_message(final_suggestion_text)
-        if any_suggestions: self.show_tuning_suggestions_window(final_suggestion_text)
+        return "\n".join(suggestion_parts), any_suggestions
+
+    def _build_valid_pairs(self):
+        """Per-channel (standard, DUT) arrays with NaN rows dropped; cached until another row is logged."""
+        key = (self.n_samples, tuple(d['channel'] for d in self.active_duts))
+        if key != self._valid_pairs_key:
+            n = self.n_samples
+            std_data = self.data_storage['Standard_Pressure_Torr'][:n]
+            # np.isnan(arr.sum()) spots a NaN without allocating a boolean array; complete columns need no mask.
+            std_has_nan = np.isnan(std_data.sum())
+            pairs = {}
+            for dut in self.active_duts:
+                dut_data = self.data_storage[f'Device_{dut["channel"]+1}_Pressure_Torr'][:n]
+                if std_has_nan or np.isnan(dut_data.sum()):
+                    valid = ~(np.isnan(std_data) | np.isnan(dut_data))
+                    pairs[dut['channel']] = (std_data[valid], dut_data[valid])
+                else:
+                    pairs[dut['channel']] = (std_data, dut_data)
+            self._valid_pairs, self._valid_pairs_key = pairs, key
+        return self._valid_pairs
 
     def update_cal_plot(self):
-        self.ax_cal.clear()
-        self.ax_cal.set_title("Calibration Curve: Standard vs. Devices")
-        self.ax_cal.set_xlabel("Standard Pressure (Torr)"); self.ax_cal.set_ylabel("Device Pressure (Torr)")
-        self.ax_cal.grid(True)
-        max_fs = self.standard_fs_value
-        for dut in self.active_duts: max_fs = max(max_fs, dut['fs'])
-        self.ax_cal.set_xlim([0, max_fs*1.05]); self.ax_cal.set_ylim([0, max_fs*1.05])
-        self.ax_cal.plot([0, max_fs], [0, max_fs], 'k--', alpha=0.5, label='Ideal 1:1 Line')
-        
-        std_data = self.data_storage['Standard_Pressure_Torr']
-        for dut in self.active_duts:
-            dut_data = self.data_storage[f'Device_{dut["channel"]+1}_Pressure_Torr']
-            valid_points = [(s, d) for s, d in zip(std_data, dut_data) if not (np.isnan(s) or np.isnan(d))]
-            if valid_points:
-                std_plot, dut_plot = zip(*valid_points)
-                color = self.dut_colors[dut['channel']]
-                self.ax_cal.plot(std_plot, dut_plot, 'o-', label=f'Device {dut["channel"]+1}', color=color)
+        # Axes, grid, ideal line and legend are drawn once in configure_plots; only the data changes here.
+        for ch, (std_plot, dut_plot) in self._build_valid_pairs().items():
+            if dut_plot.size:
+                self.cal_dut_lines[ch].set_data(std_plot, dut_plot)
 
-        self.ax_cal.legend()
         self.canvas.draw_idle()
 
     def on_closing(self):
@@ -15,21 +15,141 @@
 import serial
 import serial.tools.list_ports
 import time
-import pandas as pd
+import csv
 import re
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.gridspec as gridspec
 from matplotlib.backends.backend_tkagg import FigureCanvasTkAgg
 import matplotlib.patches as patches
-import matplotlib.transforms as transforms
 import tkinter as tk
 from tkinter import scrolledtext, ttk, messagebox
 import threading
+import concurrent.futures
 import queue
 import collections
-import statistics # Used for oscillation detection
 import json # Added for persistent learning
+import os
+
+# Numeric field in a controller reply, matched directly on the raw response bytes.
+_NUM_RE = re.compile(rb'[+-]?\d+\.?\d*')
+
+# Pre-encoded forms of the constant commands sent on every poll / valve move.
+_CMD = {cmd: (cmd + '\r').encode('ascii') for cmd in ('D1', 'C', 'R5', 'R6')}
+
+def _encode_command(command):
+    return _CMD.get(command) or (command + '\r').encode('ascii')
+
+_DAQ_READ_CMDS = [f'R{channel}'.encode('ascii') for channel in range(4)]
+
+# Full-run debug trace capacity: 4 h at the 5 Hz sample rate, after which the oldest rows are overwritten.
+# Columns: time, standard, inlet pos, outlet pos, DUT 1-4 pressure.
+_DEBUG_TRACE_LEN = 72000
+
+# Cheaper Agg rendering for the live traces: drop sub-pixel vertices and chunk long paths.
+plt.rcParams.update({'path.simplify': True, 'path.simplify_threshold': 1.0, 'agg.path.chunksize': 10000})
+
+# =================================================================================
+# RingBuffer Class (fixed-size live plot history)
+# =================================================================================
+class RingBuffer:
+    """
+    Fixed-capacity float history backed by a NumPy array. Tracks the min/max of its
+    contents incrementally so plot limits can be set without relim()/autoscale_view().
+    """
+    def __init__(self, maxlen):
+        self.maxlen = maxlen
+        self._data = np.full(maxlen, np.nan)
+        self._head = 0 # Next write position
+        self._count = 0
+        self.appended = 0 # Total appends since the last clear(); lets readers mark a position
+        self.y_min, self.y_max = np.nan, np.nan
+
+    def __len__(self):
+        return self._count
+
+    def __getitem__(self, index):
+        if index < 0: index += self._count
+        if not 0 <= index < self._count: raise IndexError("RingBuffer index out of range")
+        return self._data[(self._head - self._count + index) % self.maxlen]
+
+    def append(self, value):
+        value = np.nan if value is None else float(value)
+        evicted = self._data[self._head] if self._count == self.maxlen else np.nan
+        self._data[self._head] = value
+        self._head = (self._head + 1) % self.maxlen
+        if self._count < self.maxlen: self._count += 1
+        self.appended += 1
+
+        # O(1) unless the evicted sample was holding one of the extremes.
+        if evicted == self.y_min or evicted == self.y_max:
+            self._rescan_limits()
+        elif not np.isnan(value):
+            if np.isnan(self.y_min) or value < self.y_min: self.y_min = value
+            if np.isnan(self.y_max) or value > self.y_max: self.y_max = value
+
+    def _rescan_limits(self):
+        data = self.view()
+        if np.isnan(data).all():
+            self.y_min, self.y_max = np.nan, np.nan
+        else:
+            self.y_min, self.y_max = np.nanmin(data), np.nanmax(data)
+
+    def view(self):
+        """Returns the contents in chronological order (no copy until the buffer wraps)."""
+        if self._count < self.maxlen:
+            return self._data[:self._count]
+        if self._head == 0:
+            return self._data
+        return np.concatenate((self._data[self._head:], self._data[:self._head]))
+
+    def tail(self, n):
+        """Returns a copy of the newest n samples (fewer if not that many are held), oldest first."""
+        n = max(0, min(n, self._count))
+        return self._data[np.arange(self._head - n, self._head) % self.maxlen]
+
+    def clear(self):
+        self._data.fill(np.nan)
+        self._head, self._count, self.appended = 0, 0, 0
+        self.y_min, self.y_max = np.nan, np.nan
+
+# =================================================================================
+# BlitManager Class (repaints only the live line artists of a canvas)
+# =================================================================================
+class BlitManager:
+    """
+    Caches a canvas background on every full draw and afterwards repaints only the given
+    animated artists over it. A full draw (draw_idle) is only needed when limits change.
+    """
+    def __init__(self, canvas, artists):
+        self.canvas = canvas
+        self._bg = None
+        self._artists = list(artists)
+        for artist in self._artists:
+            artist.set_animated(True)
+        self._axes = list(dict.fromkeys(artist.axes for artist in self._artists))
+        self.cid = canvas.mpl_connect('draw_event', self._on_draw)
+
+    def _on_draw(self, event):
+        self._bg = self.canvas.copy_from_bbox(self.canvas.figure.bbox)
+        self._draw_animated()
+
+    def _draw_animated(self):
+        figure = self.canvas.figure
+        for artist in self._artists:
+            figure.draw_artist(artist)
+
+    def update(self):
+        if self._bg is None:
+            self.canvas.draw_idle() # No background yet; _on_draw will paint the artists
+            return
+        self.canvas.restore_region(self._bg)
+        self._draw_animated()
+        for ax in self._axes:
+            if ax.get_visible(): self.canvas.blit(ax.bbox)
+
+    def disconnect(self):
+        self.canvas.mpl_disconnect(self.cid)
 
 # =================================================================================
 # DAQController Class (for Multi-Channel RP2040)
@@ -42,24 +162,34 @@ class DAQController:
             time.sleep(2)
             self.is_connected = True
             self.voltage_history = {i: collections.deque(maxlen=5) for i in range(4)}
+            self.voltage_sums = {i: 0.0 for i in range(4)} # Running sum of each voltage_history window
         except serial.SerialException as e:
             raise ConnectionError(f"Failed to open DAQ port {port}: {e}")
 
     def read_voltage(self, channel):
         if not self.is_connected: return None
         try:
-            command = f'R{channel}'.encode('ascii')
-            self.ser.write(command)
+            self.ser.write(_DAQ_READ_CMDS[channel])
             self.ser.flush()
-            response = self.ser.readline().decode('ascii', errors='ignore').strip()
-            raw_voltage = float(response)
-            self.voltage_history[channel].append(raw_voltage)
-            if not self.voltage_history[channel]: return None
-            smoothed_voltage = sum(self.voltage_history[channel]) / len(self.voltage_history[channel])
+            raw_voltage = float(self.ser.readline()) # float() takes the ASCII bytes and ignores the line ending
+            history = self.voltage_history[channel]
+            if len(history) == history.maxlen:
+                self.voltage_sums[channel] -= history[0]
+            history.append(raw_voltage)
+            self.voltage_sums[channel] += raw_voltage
+            smoothed_voltage = self.voltage_sums[channel] / len(history)
             return smoothed_voltage
         except (ValueError, serial.SerialException):
             return None
 
+    def read_voltages_batch(self, channels):
+        """Reads the given channels into a length-4 array, NaN for unread or failed channels."""
+        voltages = np.full(4, np.nan)
+        for channel in channels:
+            voltage = self.read_voltage(channel)
+            if voltage is not None: voltages[channel] = voltage
+        return voltages
+
     def close(self):
         if self.is_connected and self.ser.is_open:
             self.ser.close()
@@ -82,6 +212,7 @@ class StateMachinePressureController:
         
         self.inlet_lock = threading.Lock()
         self.outlet_lock = threading.Lock()
+        self._history_lock = threading.Lock() # Serialises recording into pressure_history with clearing it
         
         self.hold_all_valves = threading.Event()
 
@@ -94,6 +225,11 @@ class StateMachinePressureController:
             self.previous_setpoint = 0.0
 
             self.pressure_history = collections.deque(maxlen=10)
+            self.sample_event = threading.Event() # Set whenever a new pressure sample is recorded
+            self.sample_counter = 0 # Total samples recorded, so pollers can tell whether anything new arrived
+            # Running (shift, n, sum, sum of squares) of pressure_history, shifted by the window's
+            # first sample to avoid cancellation. Published as one tuple for the other threads.
+            self._p_moments = (0.0, 0, 0.0, 0.0)
             
             self.is_connected = True
             self.current_pressure, self.inlet_valve_pos, self.outlet_valve_pos = None, 0.0, 0.0
@@ -106,6 +242,8 @@ class StateMachinePressureController:
             self.oscillation_counter = 0
             self.inlet_high_blind_active = False
             self.inlet_high_blind_start_time = 0
+            self._last_outlet_sp = None # Last adaptive outlet setpoint sent, on a 0.1% grid
+            self._adapt_fp = None # Inputs seen by the last adaptive pass
 
         except serial.SerialException as e:
             self.close()
@@ -115,9 +253,8 @@ class StateMachinePressureController:
         with self.inlet_lock:
             if not self.is_connected or not self.ser_inlet: return
             try:
-                full_command = (command + '\r').encode('ascii')
+                full_command = _encode_command(command)
                 self.ser_inlet.write(full_command)
-                self.ser_inlet.flush()
             except serial.SerialTimeoutException:
                 self.log_queue.put("ERROR: Write timeout on Inlet Controller!")
 
@@ -125,11 +262,9 @@ class StateMachinePressureController:
         with self.inlet_lock:
             if not self.is_connected or not self.ser_inlet: return None
             try:
-                full_command = (command + '\r').encode('ascii')
+                full_command = _encode_command(command)
                 self.ser_inlet.write(full_command)
-                self.ser_inlet.flush()
-                response_bytes = self.ser_inlet.readline()
-                return response_bytes.decode('ascii', errors='ignore').strip()
+                return self.ser_inlet.readline() # Raw bytes; callers parse or decode as needed
             except serial.SerialTimeoutException:
                 self.log_queue.put("ERROR: Write timeout on Inlet Controller query!")
                 return None
@@ -138,9 +273,8 @@ class StateMachinePressureController:
         with self.outlet_lock:
             if not self.is_connected or not self.ser_outlet: return
             try:
-                full_command = (command + '\r').encode('ascii')
+                full_command = _encode_command(command)
                 self.ser_outlet.write(full_command)
-                self.ser_outlet.flush()
             except serial.SerialTimeoutException:
                 self.log_queue.put("ERROR: Write timeout on Outlet Controller!")
 
@@ -148,15 +282,41 @@ class StateMachinePressureController:
         with self.outlet_lock:
             if not self.is_connected or not self.ser_outlet: return None
             try:
-                full_command = (command + '\r').encode('ascii')
+                full_command = _encode_command(command)
                 self.ser_outlet.write(full_command)
-                self.ser_outlet.flush()
-                response_bytes = self.ser_outlet.readline()
-                return response_bytes.decode('ascii', errors='ignore').strip()
+                return self.ser_outlet.readline()
             except serial.SerialTimeoutException:
                 self.log_queue.put("ERROR: Write timeout on Outlet Controller query!")
                 return None
 
+    def _query_both(self, command):
+        """
+        Sends one query to both controllers before reading either reply, so their turnarounds overlap.
+        Returns None only if nothing was sent (safe to retry one at a time). Once a write has gone out,
+        a failed write or empty (timed-out) reply is returned as b'' after discarding whatever that
+        port may still answer, so a late reply can't be read as the answer to the next query.
+        """
+        with self.inlet_lock, self.outlet_lock: # Always inlet then outlet to avoid lock-order deadlock
+            if not self.is_connected or not self.ser_inlet or not self.ser_outlet: return None
+            full_command = _encode_command(command)
+            ports = (self.ser_inlet, self.ser_outlet)
+            sent = []
+            try:
+                for ser in ports:
+                    sent.append(ser) # Counted before the write: a timed-out write may still be partly on the wire
+                    ser.write(full_command)
+            except serial.SerialTimeoutException:
+                self.log_queue.put(f"ERROR: Write timeout on {'Inlet' if len(sent) == 1 else 'Outlet'} Controller query!")
+                for ser in sent: ser.reset_input_buffer()
+                if len(sent) == 1: return None # Inlet write failed and the outlet was never queried
+                return b'', b''
+            replies = []
+            for ser in ports:
+                reply = ser.readline()
+                if not reply: ser.reset_input_buffer() # readline() timed out; drop any late reply
+                replies.append(reply)
+            return tuple(replies)
+
     def start(self):
         if self._polling_thread is None:
             self._stop_event.clear()
@@ -182,41 +342,79 @@ class StateMachinePressureController:
             pressure = self.get_pressure()
             if pressure is not None:
                 self.current_pressure = pressure
-                self.pressure_history.append(self.current_pressure)
+                self._record_pressure(pressure)
             self.get_valve_positions()
-            time.sleep(0.2)
+            if self._stop_event.wait(0.2): return
+
+    def _record_pressure(self, pressure):
+        with self._history_lock:
+            history = self.pressure_history
+            if not history: # Fresh window (set_pressure clears it): restart the sums
+                shift, p_sum, p_sqsum = pressure, 0.0, 0.0
+            else:
+                shift, _, p_sum, p_sqsum = self._p_moments
+                if len(history) == history.maxlen:
+                    evicted = history[0] - shift
+                    p_sum -= evicted; p_sqsum -= evicted * evicted
+            history.append(pressure)
+            d = pressure - shift
+            self._p_moments = (shift, len(history), p_sum + d, p_sqsum + d * d)
+        self.sample_counter += 1
+        self.sample_event.set()
+
+    def _clear_pressure_history(self):
+        with self._history_lock:
+            self.pressure_history.clear()
+            self._p_moments = (0.0, 0, 0.0, 0.0)
+
+    def _mean_pressure(self):
+        shift, n, p_sum, _ = self._p_moments
+        if n < 1: raise ValueError("mean requires at least one data point")
+        return shift + p_sum / n
+
+    def _std_pressure(self):
+        _, n, p_sum, p_sqsum = self._p_moments
+        if n < 2: raise ValueError("variance requires at least two data points")
+        return (max(p_sqsum - p_sum * p_sum / n, 0.0) / (n - 1)) ** 0.5
         
     def _run_adaptive_outlet_loop(self):
         while not self._stop_event.is_set():
             if self.hold_all_valves.is_set():
-                time.sleep(1.0)
+                if self._stop_event.wait(1.0): return
                 continue
 
             if self.hold_outlet_valve:
-                time.sleep(1.0)
+                if self._stop_event.wait(1.0): return
                 continue
 
             if len(self.pressure_history) < self.pressure_history.maxlen or self.system_setpoint <= 0 or self.current_pressure is None or self.inlet_valve_pos is None:
-                time.sleep(1.0)
+                if self._stop_event.wait(1.0): return
                 continue
 
-            try:
-                if self.inlet_high_blind_active and (time.time() - self.inlet_high_blind_start_time) > 10.0:
-                    self.log_queue.put(">> Adaptive logic blind deactivated.")
-                    self.inlet_high_blind_active = False
+            if self.inlet_high_blind_active and (time.time() - self.inlet_high_blind_start_time) > 10.0:
+                self.log_queue.put(">> Adaptive logic blind deactivated.")
+                self.inlet_high_blind_active = False
+
+            # Nothing has moved since the last pass (steady state): the decision would be the same.
+            fp = (round(self.current_pressure, 3), round(self.inlet_valve_pos, 2), round(self.outlet_valve_pos, 2), self.system_setpoint)
+            if fp == self._adapt_fp:
+                if self._stop_event.wait(3.0): return
+                continue
+            self._adapt_fp = fp
 
+            try:
                 current_outlet_pos = self.outlet_valve_pos
                 inlet_valve_pos = self.inlet_valve_pos
                 error = self.current_pressure - self.system_setpoint
                 new_outlet_pos = current_outlet_pos
                 log_reason = "Holding"
 
-                mean_pressure = statistics.mean(self.pressure_history)
+                mean_pressure = self._mean_pressure()
                 is_near_setpoint = abs(mean_pressure - self.system_setpoint) < (self.full_scale_pressure * 0.02)
 
                 if is_near_setpoint:
                     pressure_oscillation_threshold = (self.system_setpoint * 0.005) + (self.full_scale_pressure * 0.001)
-                    pressure_std_dev = statistics.stdev(self.pressure_history)
+                    pressure_std_dev = self._std_pressure()
                     if pressure_std_dev > pressure_oscillation_threshold:
                         self.oscillation_counter += 1
                     else:
@@ -231,7 +429,7 @@ class StateMachinePressureController:
                         log_reason = f"EMERGENCY DESCENT (Err: {error:+.1f})"
                     else:
                         new_outlet_pos = current_outlet_pos - 0.2
-                        log_reason = f"Pressure oscillating (StdDev: {statistics.stdev(self.pressure_history):.3f} Torr)"
+                        log_reason = f"Pressure oscillating (StdDev: {self._std_pressure():.3f} Torr)"
                     self.oscillation_counter = 0
                 
                 elif inlet_valve_pos < 1.0 and error > 0.1:
@@ -241,7 +439,7 @@ class StateMachinePressureController:
 
                 else:
                     step_size = 0.5
-                    is_pressure_stable = statistics.stdev(self.pressure_history) < (0.005 + (self.system_setpoint * 0.001))
+                    is_pressure_stable = self._std_pressure() < (0.005 + (self.system_setpoint * 0.001))
 
                     if is_pressure_stable and error > 0.2 and not self.inlet_high_blind_active:
                         self.oscillation_cooldown = False 
@@ -272,7 +470,7 @@ class StateMachinePressureController:
                             new_outlet_pos = current_outlet_pos
                 
                 if log_reason == "Holding" and self.inlet_high_blind_active:
-                    time.sleep(3.0)
+                    if self._stop_event.wait(3.0): return
                     continue
 
                 min_clamp = 22.0 
@@ -284,29 +482,34 @@ class StateMachinePressureController:
                 clamped_pos = max(min_clamp, min(max_clamp, new_outlet_pos))
 
                 if abs(clamped_pos - current_outlet_pos) > 0.1:
-                    if log_reason != self.last_log_reason:
-                        self.log_queue.put(f"ADAPT -> Outlet to {clamped_pos:.1f}%. Reason: {log_reason}")
-                        self.last_log_reason = log_reason
-                    self._write_to_outlet(f"S1 {clamped_pos:.2f}")
-                    self._write_to_outlet("D1")
+                    q_pos = round(clamped_pos * 10) / 10.0
+                    if q_pos != self._last_outlet_sp: # Already commanded there: let the valve travel
+                        if log_reason != self.last_log_reason:
+                            self.log_queue.put(f"ADAPT -> Outlet to {q_pos:.1f}%. Reason: {log_reason}")
+                            self.last_log_reason = log_reason
+                        self._write_to_outlet(f"S1 {q_pos:.2f}")
+                        self._write_to_outlet("D1")
+                        self._last_outlet_sp = q_pos
                 else:
                     self.last_log_reason = ""
 
-            except (statistics.StatisticsError, AttributeError, IndexError):
+            except (ValueError, AttributeError, IndexError):
                 pass
             
-            time.sleep(3.0)
+            if self._stop_event.wait(3.0): return
 
     def set_pressure(self, pressure, predicted_outlet_pos=None):
         self.hold_all_valves.clear()
         self.log_queue.put(f">> New system setpoint: {pressure:.3f} Torr")
         self.previous_setpoint = self.system_setpoint
         self.system_setpoint = pressure
-        self.pressure_history.clear()
+        self._clear_pressure_history()
         self.fine_tuning_mode = False
         self.last_log_reason = ""
         self.max_slope_hold = False
         self.oscillation_cooldown = False
+        self._last_outlet_sp = None # set_pressure may move the outlet itself
+        self._adapt_fp = None
 
         if pressure == 0:
             self.log_queue.put(">> PUMP TO ZERO MODE: Inlet closed, Outlet fully open.")
@@ -351,7 +554,7 @@ class StateMachinePressureController:
         response = self._query_inlet("R5")
         if response:
             try:
-                match = re.search(r'[+-]?\d+\.?\d*', response)
+                match = _NUM_RE.search(response)
                 if match:
                     return (float(match.group()) / 100) * self.full_scale_pressure
             except (ValueError, IndexError): return None
@@ -359,18 +562,20 @@ class StateMachinePressureController:
     
     def get_valve_positions(self):
         try:
-            inlet_res = self._query_inlet("R6")
-            outlet_res = self._query_outlet("R6")
+            responses = self._query_both("R6")
+            if responses is None: # Nothing was sent: fall back to one controller at a time
+                responses = self._query_inlet("R6"), self._query_outlet("R6")
+            inlet_res, outlet_res = responses
             
             if inlet_res:
-                inlet_match = re.search(r'[+-]?\d+\.?\d*', inlet_res)
+                inlet_match = _NUM_RE.search(inlet_res)
                 if inlet_match: 
                     pos = float(inlet_match.group())
                     self.inlet_valve_pos = pos
                     self.inlet_pos_history.append(pos)
             
             if outlet_res:
-                outlet_match = re.search(r'[+-]?\d+\.?\d*', outlet_res)
+                outlet_match = _NUM_RE.search(outlet_res)
                 if outlet_match: self.outlet_valve_pos = float(outlet_match.group())
 
         except (ValueError, IndexError, AttributeError):
@@ -381,6 +586,11 @@ class StateMachinePressureController:
         self.log_queue.put(">> All valves commanded to close.")
         self._write_to_inlet("C")
         self._write_to_outlet("C")
+        self._last_outlet_sp = None
+        # Writes are otherwise left to drain on their own; make sure the close commands are on the wire.
+        for ser, lock in ((self.ser_inlet, self.inlet_lock), (self.ser_outlet, self.outlet_lock)):
+            with lock:
+                if ser and ser.is_open: ser.flush()
         time.sleep(0.5)
             
     def close(self):
@@ -390,6 +600,21 @@ class StateMachinePressureController:
             if self.ser_outlet and self.ser_outlet.is_open: self.ser_outlet.close()
             self.is_connected = False
         
+# =================================================================================
+# Analysis Helpers
+# =================================================================================
+def _linfit(x, y):
+    """Closed-form least-squares line y = slope*x + intercept (same result as np.polyfit(x, y, 1))."""
+    xm, ym = x.mean(), y.mean()
+    dx = x - xm
+    slope = (dx @ (y - ym)) / (dx @ dx)
+    return slope, ym - slope * xm
+
+def _finite_mean(x):
+    """Mean of the non-NaN entries of x, or NaN if there are none (np.nanmean without the warning)."""
+    x = x[x == x]
+    return x.mean() if x.size else np.nan
+
 # =================================================================================
 # Main GUI Class
 # =================================================================================
@@ -403,10 +628,15 @@ class CalibrationGUI(tk.Tk):
 
         self.state_controller = None
         self.daq = None
+        self._dut_active_mask = np.zeros(4, dtype=bool)
+        self._dut_fs = np.full(4, np.nan)
+        self._dut_channels = []
         self.is_calibrating = False
         self.is_in_manual_mode = False
         self.start_time = 0
         self.after_id = None
+        self.log_after_id = None
+        self.com_scan_after_id = None
         self._manual_learn_thread = None
         self.last_manual_stability_state = False
 
@@ -414,11 +644,21 @@ class CalibrationGUI(tk.Tk):
         
         self.data_storage = {}
         self.error_plot_data = {}
+        self._error_bars = {} # ch -> {sp: (error, bar patch, time label or None)} already on ax_error
+        self._error_bar_height = None # Bar height the drawn bars were laid out with; None forces a rebuild
         self.log_queue = queue.Queue()
+        self._log_chunks = queue.Queue() # Pre-formatted text batches from the log drainer thread
+        self._com_ports_q = queue.Queue() # Port lists from the COM scan thread, applied on the Tk loop
+        threading.Thread(target=self._log_drainer, daemon=True).start()
         
         self.learned_positions_file = "learned_outlet_positions.json"
         self.learned_data = {} 
         self.learned_outlet_positions = {}
+        self._prediction_arrays = (np.empty(0), np.empty(0), {})
+        self._learned_version = 0 # Bumped on every change to the learned positions
+        self._predict_cache = (None, None, -1) # (target_sp, result, _learned_version) of the last prediction
+        self._learned_dirty = False # Set when a point is learned; cleared once it is on disk
+        self._learned_save_lock = threading.Lock()
         try:
             with open(self.learned_positions_file, 'r') as f:
                 self.learned_data = json.load(f)
@@ -429,25 +669,35 @@ class CalibrationGUI(tk.Tk):
         
         self.manual_focus_device = tk.StringVar(value="std")
         self.manual_focus_channel = None
+        self._manual_focus_fs = None
 
         self.live_pressure_var = tk.StringVar(value="---.-- Torr")
-        self.live_time_history = collections.deque(maxlen=500)
-        self.live_std_pressure_history = collections.deque(maxlen=500)
-        self.live_dut_pressure_history = {i: collections.deque(maxlen=500) for i in range(4)}
-
-        self.manual_trace_time = collections.deque(maxlen=200)
-        self.manual_trace_std = collections.deque(maxlen=200)
-        self.manual_trace_duts = {i: collections.deque(maxlen=200) for i in range(4)}
-
-        self.debug_full_time = []
-        self.debug_full_std_pressure = []
-        self.debug_full_dut_pressure = {i: [] for i in range(4)}
-        self.debug_full_inlet_pos = []
-        self.debug_full_outlet_pos = []
+        self.live_time_history = RingBuffer(500)
+        self.live_std_pressure_history = RingBuffer(500)
+        self.live_dut_pressure_history = {i: RingBuffer(500) for i in range(4)}
+
+        self.manual_trace_time = RingBuffer(200)
+        self.manual_trace_std = RingBuffer(200)
+        self.manual_trace_duts = {i: RingBuffer(200) for i in range(4)}
+
+        self._debug_trace = np.full((_DEBUG_TRACE_LEN, 8), np.nan)
+        self._debug_head = 0 # Next row to write
+        self._debug_count = 0
+
+        self.live_blit = None
+        self._manual_view_active = False
+        self._live_view_stale = False
+        self._sample_q = queue.Queue(maxsize=64)
+        self._sample_stop = threading.Event()
+        # One worker: manual setpoint changes run off the Tk thread, in click order, without racing each other.
+        self._setp_pool = concurrent.futures.ThreadPoolExecutor(max_workers=1, thread_name_prefix='setp')
+        self._var_text = {} # Last text written to each StringVar through _set_if_changed
         
         self.setup_ui()
         self.protocol("WM_DELETE_WINDOW", self.on_closing)
         self.after_id = self.after(100, self.periodic_update)
+        self.log_after_id = self.after(100, self._flush_log_chunk)
+        self.after_idle(self._rescan_com_ports_async) # Enumerate once the main loop is running, off the first paint
 
     def setup_ui(self):
         top_config_frame = tk.Frame(self)
@@ -460,19 +710,18 @@ class CalibrationGUI(tk.Tk):
         config_frame = tk.LabelFrame(top_config_frame, text="Configuration", padx=10, pady=10)
         config_frame.grid(row=0, column=0, sticky="nsew", padx=(0, 5))
         
-        com_ports = [port.device for port in serial.tools.list_ports.comports()]
         valid_ranges = sorted([0.1, 0.2, 0.5, 1.0, 2.0, 5.0, 10.0, 20.0, 50.0, 100.0, 500.0, 1000.0])
 
         tk.Label(config_frame, text="Inlet Controller (Inverse):").grid(row=0, column=0, sticky="w", columnspan=2)
         tk.Label(config_frame, text="COM Port:").grid(row=1, column=0, sticky="e", padx=5)
         self.inlet_com_var = tk.StringVar(self, value="COM5")
-        self.inlet_com_combo = ttk.Combobox(config_frame, textvariable=self.inlet_com_var, values=com_ports, width=10)
+        self.inlet_com_combo = ttk.Combobox(config_frame, textvariable=self.inlet_com_var, values=[], width=10)
         self.inlet_com_combo.grid(row=1, column=1, sticky="w")
         
         tk.Label(config_frame, text="Outlet Controller (Direct):").grid(row=2, column=0, sticky="w", pady=(8,0), columnspan=2)
         tk.Label(config_frame, text="COM Port:").grid(row=3, column=0, sticky="e", padx=5)
         self.outlet_com_var = tk.StringVar(self, value="COM6")
-        self.outlet_com_combo = ttk.Combobox(config_frame, textvariable=self.outlet_com_var, values=com_ports, width=10)
+        self.outlet_com_combo = ttk.Combobox(config_frame, textvariable=self.outlet_com_var, values=[], width=10)
         self.outlet_com_combo.grid(row=3, column=1, sticky="w")
 
         tk.Label(config_frame, text="System FS (Torr):").grid(row=4, column=0, sticky="e", padx=5, pady=(8,0))
@@ -483,9 +732,12 @@ class CalibrationGUI(tk.Tk):
         tk.Label(config_frame, text="DAQ (RP2040):").grid(row=5, column=0, sticky="w", pady=(10,0), columnspan=2)
         tk.Label(config_frame, text="COM Port:").grid(row=6, column=0, sticky="e", padx=5)
         self.daq_com_var = tk.StringVar(self, value="COM7")
-        self.daq_com_combo = ttk.Combobox(config_frame, textvariable=self.daq_com_var, values=com_ports, width=10)
+        self.daq_com_combo = ttk.Combobox(config_frame, textvariable=self.daq_com_var, values=[], width=10)
         self.daq_com_combo.grid(row=6, column=1, sticky="w")
 
+        self.rescan_button = tk.Button(config_frame, text="Rescan", command=self._rescan_com_ports_async)
+        self.rescan_button.grid(row=7, column=1, sticky="w", pady=(8,0))
+
         dut_frame = tk.LabelFrame(top_config_frame, text="Devices Under Test (DUTs)", padx=10, pady=10)
         dut_frame.grid(row=0, column=1, sticky="nsew", padx=(5, 5))
         self.dut_widgets = []
@@ -513,17 +765,21 @@ class CalibrationGUI(tk.Tk):
         tk.Label(valve_status_frame, textvariable=self.inlet_pos_var, font=("Helvetica", 16, "bold")).grid(row=1, column=0)
         tk.Label(valve_status_frame, textvariable=self.outlet_pos_var, font=("Helvetica", 16, "bold")).grid(row=1, column=1)
 
-        self.inlet_valve_fig, self.ax_inlet_valve = plt.subplots(figsize=(1.2, 1.2), dpi=80)
-        self.outlet_valve_fig, self.ax_outlet_valve = plt.subplots(figsize=(1.2, 1.2), dpi=80)
-
-        self.inlet_valve_canvas = FigureCanvasTkAgg(self.inlet_valve_fig, master=valve_status_frame)
-        self.outlet_valve_canvas = FigureCanvasTkAgg(self.outlet_valve_fig, master=valve_status_frame)
-
-        self._draw_valve(self.ax_inlet_valve, 0)
-        self._draw_valve(self.ax_outlet_valve, 0)
-
-        self.inlet_valve_canvas.get_tk_widget().grid(row=2, column=0, pady=(5,0))
-        self.outlet_valve_canvas.get_tk_widget().grid(row=2, column=1, pady=(5,0))
+        self.inlet_valve_canvas = tk.Canvas(valve_status_frame, width=96, height=96, bg='white', highlightthickness=0)
+        self.outlet_valve_canvas = tk.Canvas(valve_status_frame, width=96, height=96, bg='white', highlightthickness=0)
+
+        # Valve bodies are drawn once; only the butterfly polygon's coords change with position.
+        self._valve_lut = self._build_valve_lut()
+        self._valve_artists = {
+            'inlet': self._build_valve(self.inlet_valve_canvas),
+            'outlet': self._build_valve(self.outlet_valve_canvas),
+        }
+        self._last_valve_pos = {'inlet': None, 'outlet': None}
+        self._update_valve('inlet', 0)
+        self._update_valve('outlet', 0)
+
+        self.inlet_valve_canvas.grid(row=2, column=0, pady=(5,0))
+        self.outlet_valve_canvas.grid(row=2, column=1, pady=(5,0))
         
         pressure_readout_frame = tk.LabelFrame(top_config_frame, text="Live System Pressure", padx=10, pady=10)
         pressure_readout_frame.grid(row=0, column=3, sticky="nsew")
@@ -571,34 +827,56 @@ class CalibrationGUI(tk.Tk):
         self.e_stop_button = tk.Button(action_frame, text="E-Stop", command=self.e_stop_action, bg="red", fg="white", state=tk.DISABLED, width=15)
         self.e_stop_button.pack(side=tk.LEFT, padx=5)
 
-    def _draw_valve(self, ax, position_percent):
-        ax.clear()
-        ax.set_xlim(-1.2, 1.2)
-        ax.set_ylim(-1.2, 1.2)
-        ax.axis('off')
-
-        valve_body = patches.Circle((0, 0), 1, facecolor='#c0c0c0', edgecolor='black', linewidth=1.5)
-        ax.add_patch(valve_body)
-        
-        normalized_pos = position_percent / 100.0
-        scaled_pos = normalized_pos ** 0.5
-        
-        final_angle_deg = scaled_pos * 90.0
-        final_angle_rad = np.deg2rad(final_angle_deg)
-        
-        ellipse_width = 2 * np.cos(final_angle_rad)
-        
-        butterfly = patches.Ellipse((0,0), width=ellipse_width, height=2, facecolor='#5a5a5a', edgecolor='black')
-        
-        transform = transforms.Affine2D().rotate_deg(90 - final_angle_deg) + ax.transData
-        butterfly.set_transform(transform)
-
-        ax.add_patch(butterfly)
-        
-        if ax == self.ax_inlet_valve:
-            self.inlet_valve_canvas.draw_idle()
-        elif ax == self.ax_outlet_valve:
-            self.outlet_valve_canvas.draw_idle()
+    @staticmethod
+    def _build_valve_lut():
+        """
+        Butterfly polygon canvas coords for every 0.1 % of valve position (1001 rows). The disc is
+        an ellipse of half-width cos(angle) and unit half-height rotated by (90 - angle) degrees,
+        where angle = sqrt(position) * 90. Tk ovals cannot be rotated, hence the 36-point polygon.
+        """
+        t = np.linspace(0, 2 * np.pi, 36, endpoint=False)
+        angle = np.sqrt(np.arange(1001) / 1000.0)[:, None] * 90.0
+        x = np.cos(np.deg2rad(angle)) * np.cos(t)
+        y = np.sin(t)
+        rot = np.deg2rad(90 - angle)
+        lut = np.empty((angle.shape[0], t.size, 2))
+        # 96 px canvas spanning -1.2..1.2 valve units, i.e. 40 px per unit about the centre.
+        lut[:, :, 0] = 48 + 40 * (x * np.cos(rot) - y * np.sin(rot))
+        lut[:, :, 1] = 48 - 40 * (x * np.sin(rot) + y * np.cos(rot))
+        return lut.reshape(angle.shape[0], -1)
+
+    def _build_valve(self, canvas):
+        canvas.create_oval(8, 8, 88, 88, fill='#c0c0c0', outline='black', width=1.5)
+        butterfly_id = canvas.create_polygon(0, 0, 0, 0, 0, 0, fill='#5a5a5a', outline='black')
+        return canvas, butterfly_id
+
+    def _update_valve(self, which, position_percent):
+        last_pos = self._last_valve_pos[which]
+        if last_pos is not None and abs(position_percent - last_pos) < 0.2: return
+        self._last_valve_pos[which] = position_percent
+        canvas, butterfly_id = self._valve_artists[which]
+        idx = min(1000, max(0, int(position_percent * 10)))
+        canvas.coords(butterfly_id, *self._valve_lut[idx].tolist())
+
+    def _rescan_com_ports_async(self):
+        if self.com_scan_after_id: return # A scan is already in flight
+        self.rescan_button.config(state=tk.DISABLED)
+        def scan():
+            self._com_ports_q.put([port.device for port in serial.tools.list_ports.comports()])
+        threading.Thread(target=scan, daemon=True).start()
+        self.com_scan_after_id = self.after(50, self._poll_com_ports)
+
+    def _poll_com_ports(self):
+        # The scan thread only fills the queue; Tk calls stay on the main thread.
+        try:
+            com_ports = self._com_ports_q.get_nowait()
+        except queue.Empty:
+            self.com_scan_after_id = self.after(50, self._poll_com_ports)
+            return
+        self.com_scan_after_id = None
+        for combo in (self.inlet_com_combo, self.outlet_com_combo, self.daq_com_combo):
+            combo.configure(values=com_ports)
+        if self.connect_button['state'] != tk.DISABLED: self.rescan_button.config(state=tk.NORMAL)
 
     def send_manual_command(self, event=None):
         command = self.command_entry.get().strip()
@@ -606,7 +884,8 @@ class CalibrationGUI(tk.Tk):
         if not command: return
         self.log_message(f"> {command}")
         if self.state_controller and self.state_controller.is_connected:
-            response = self.state_controller._query_inlet(command)
+            raw = self.state_controller._query_inlet(command)
+            response = raw.decode('ascii', errors='ignore').strip() if raw else ""
             if response: self.log_message(f"Response: {response}")
             else: self.log_message("Command sent (no response).")
         else:
@@ -629,13 +908,23 @@ class CalibrationGUI(tk.Tk):
 
             self.active_duts = [{'channel': i, 'fs': float(w['fs'].get())} for i, w in enumerate(self.dut_widgets) if w['enabled'].get()]
             if not self.active_duts: raise ValueError("At least one DUT must be enabled.")
+            self._dut_active_mask = np.zeros(4, dtype=bool)
+            self._dut_fs = np.full(4, np.nan)
+            for d in self.active_duts:
+                self._dut_active_mask[d['channel']] = True
+                self._dut_fs[d['channel']] = d['fs']
+            self._dut_channels = [d['channel'] for d in self.active_duts]
+            # Legend proxies for the error plot; only the DUT selection changes them.
+            self._cached_error_handles = [patches.Patch(color=self.dut_colors[ch], label=f"DUT {ch+1}") for ch in self._dut_channels]
             
             fs_key = str(self.standard_fs_value)
             raw_data = self.learned_data.get(fs_key, {})
-            self.learned_outlet_positions = {float(k): v for k, v in raw_data.items()}
+            self.learned_outlet_positions = {float(k): collections.deque(v, maxlen=10) for k, v in raw_data.items() if isinstance(v, list)}
+            self._rebuild_prediction_arrays()
             self.log_message(f"Activated learning profile for {fs_key} Torr FS ({len(self.learned_outlet_positions)} points).")
 
             self.start_time = time.time()
+            threading.Thread(target=self._run_sample_worker, daemon=True).start()
             self.start_button.config(state=tk.NORMAL); self.e_stop_button.config(state=tk.DISABLED)
             self.manual_cal_button.config(state=tk.NORMAL)
             self.connect_button.config(state=tk.DISABLED)
@@ -647,6 +936,7 @@ class CalibrationGUI(tk.Tk):
     def set_config_state(self, state):
         self.inlet_com_combo.config(state=state); self.outlet_com_combo.config(state=state)
         self.std_fs_menu.config(state=state); self.daq_com_combo.config(state=state)
+        self.rescan_button.config(state=state)
         for widget_set in self.dut_widgets:
             widget_set['check'].config(state=state); widget_set['menu'].config(state=state)
 
@@ -654,7 +944,7 @@ class CalibrationGUI(tk.Tk):
         if self.is_calibrating or self.is_in_manual_mode:
             self.is_calibrating = False; self.is_in_manual_mode = False
             self.log_message("\n*** E-STOP ***\nProcess stopped. Saving learned data...")
-            self._save_learned_data()
+            threading.Thread(target=self._save_learned_data, daemon=True).start() # Keep file I/O off the Tk thread
             
             if self.state_controller: self.state_controller.close_valves()
             self.start_button.config(state=tk.NORMAL); self.manual_cal_button.config(state=tk.NORMAL)
@@ -666,12 +956,15 @@ class CalibrationGUI(tk.Tk):
         
         self.ax_live_pressure.set_title("Live Pressure Trace"); self.ax_live_pressure.set_xlabel("Time (s)")
         self.ax_live_pressure.set_ylabel("Pressure (Torr)"); self.ax_live_pressure.grid(True, linestyle=':')
-        self.live_std_plot, = self.ax_live_pressure.plot([], [], 'blue', linewidth=2, label='Standard')
+        self.live_std_plot, = self.ax_live_pressure.plot([], [], 'blue', linewidth=1, label='Standard')
         self.live_dut_plots = {}
         for i in range(4):
             line, = self.ax_live_pressure.plot([], [], color=self.dut_colors[i], label=f'DUT {i+1}')
+            line.set_visible(self._dut_active_mask[i])
             self.live_dut_plots[i] = line
         self.ax_live_pressure.legend(loc='upper left')
+        if self.live_blit is not None: self.live_blit.disconnect()
+        self.live_blit = BlitManager(self.canvas, [self.live_std_plot] + list(self.live_dut_plots.values()))
 
         self.ax_error.set_title("DUT Deviation from Standard")
         self.ax_error.set_xlabel("Error (Torr)")
@@ -693,103 +986,179 @@ class CalibrationGUI(tk.Tk):
         self.ax_error.axvline(0, color='k', linestyle='--', alpha=0.5)
         self.ax_error.grid(True, linestyle=':')
         
-        handles = [patches.Patch(color=self.dut_colors[dut['channel']], label=f"DUT {dut['channel']+1}") for dut in self.active_duts]
-        self.ax_error.legend(handles=handles, loc='best')
+        self.ax_error.legend(handles=self._cached_error_handles, loc='best')
 
     def log_message(self, message):
         self.log_queue.put(message)
 
-    def periodic_update(self):
-        current_time = time.time() - self.start_time if self.start_time > 0 else -1
-
-        while not self.log_queue.empty():
+    def _update_trace_limits(self, ax, t_max, window, y_series, refit=False):
+        """
+        Scrolls the x-axis in steps of a tenth of the window and grows the y-axis only when
+        data leaves it. Returns True when limits changed and a full redraw is required.
+        The y-range is refit to the buffers' running extremes only on an x step; between steps
+        only the newest sample of each series is checked against the current limits.
+        refit forces a step, e.g. after the axes were hidden while data kept arriving.
+        """
+        x_lo, x_hi = ax.get_xlim()
+        if refit or t_max > x_hi or t_max < x_lo:
+            new_hi = t_max + window * 0.1
+            ax.set_xlim(max(0, new_hi - window), new_hi)
+            filled = [series for series in y_series if not np.isnan(series.y_min)]
+            if filled: self._set_trace_ylim(ax, min(series.y_min for series in filled), max(series.y_max for series in filled))
+            return True
+        newest = [series[-1] for series in y_series if series and np.isfinite(series[-1])]
+        if not newest: return False
+        lo, hi = min(newest), max(newest)
+        y_lo, y_hi = ax.get_ylim()
+        if lo >= y_lo and hi <= y_hi: return False
+        self._set_trace_ylim(ax, min(lo, y_lo), max(hi, y_hi))
+        return True
+
+    def _set_trace_ylim(self, ax, lo, hi):
+        pad = (hi - lo) * 0.1 or max(abs(hi) * 0.05, 0.01)
+        ax.set_ylim(lo - pad, hi + pad)
+
+    def _log_drainer(self):
+        """Background thread: timestamps queued messages and batches them (up to 50 or 100 ms) into text chunks."""
+        while True:
             msg = self.log_queue.get()
-            if current_time >= 0:
-                timestamp = f"[{current_time: >7.2f}s]"
-            else:
-                timestamp = "[  --.--s]"
+            chunk = []
+            deadline = time.monotonic() + 0.1
+            while True:
+                current_time = time.time() - self.start_time if self.start_time > 0 else -1
+                timestamp = f"[{current_time: >7.2f}s]" if current_time >= 0 else "[  --.--s]"
+                chunk.append(f"\n{timestamp} {msg}")
+                remaining = deadline - time.monotonic()
+                if len(chunk) >= 50 or remaining <= 0: break
+                try:
+                    msg = self.log_queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+            self._log_chunks.put(''.join(chunk))
+
+    def _flush_log_chunk(self):
+        # Tk calls stay on the main thread; everything pending goes in with a single insert.
+        chunks = []
+        while True:
+            try:
+                chunks.append(self._log_chunks.get_nowait())
+            except queue.Empty:
+                break
+        if chunks:
             self.terminal_text.config(state=tk.NORMAL)
-            self.terminal_text.insert(tk.END, f"\n{timestamp} {msg}")
+            self.terminal_text.insert(tk.END, ''.join(chunks))
             self.terminal_text.see(tk.END)
             self.terminal_text.config(state=tk.DISABLED)
-        
-        if self.state_controller and self.state_controller.is_connected:
-            std_pressure = self.state_controller.current_pressure
-            inlet_pos = self.state_controller.inlet_valve_pos
-            outlet_pos = self.state_controller.outlet_valve_pos
-            
-            if std_pressure is not None:
-                self.live_pressure_var.set(f"{std_pressure:.3f} Torr")
-            else:
-                self.live_pressure_var.set("---.-- Torr")
+        self.log_after_id = self.after(100, self._flush_log_chunk)
+
+    def _set_if_changed(self, var, text):
+        # Skips the Tk variable write (and the label redraw it triggers) when the text is unchanged.
+        name = str(var)
+        if self._var_text.get(name) != text:
+            self._var_text[name] = text
+            var.set(text)
+
+    def _run_sample_worker(self):
+        """Background thread: samples the controller state and DAQ voltages every 200 ms into _sample_q."""
+        while not self._sample_stop.is_set():
+            sc = self.state_controller
+            if sc and sc.is_connected:
+                current_time = time.time() - self.start_time
+                voltages = self.daq.read_voltages_batch(self._dut_channels) if self.daq else np.full(4, np.nan)
+                sample = (current_time, sc.current_pressure, sc.inlet_valve_pos, sc.outlet_valve_pos, voltages)
+                try:
+                    self._sample_q.put_nowait(sample)
+                except queue.Full: # GUI stalled; drop the oldest sample rather than block acquisition
+                    try: self._sample_q.get_nowait()
+                    except queue.Empty: pass
+                    self._sample_q.put_nowait(sample)
+            if self._sample_stop.wait(0.2): return
 
-            self.live_time_history.append(current_time)
-            self.live_std_pressure_history.append(std_pressure)
-            self.manual_trace_time.append(current_time)
-            self.manual_trace_std.append(std_pressure)
+    def periodic_update(self):
+        samples = []
+        while True:
+            try:
+                samples.append(self._sample_q.get_nowait())
+            except queue.Empty:
+                break
+
+        if samples:
+            for current_time, std_pressure, inlet_pos, outlet_pos, voltages in samples:
+                self.live_time_history.append(current_time)
+                self.live_std_pressure_history.append(std_pressure)
+                self.manual_trace_time.append(current_time)
+                self.manual_trace_std.append(std_pressure)
+
+                # Inactive channels have NaN full scale, so their pressures come out NaN too.
+                dut_pressures = (voltages * (self._dut_fs / 9.9)).tolist()
+                for i, dut_pressure in enumerate(dut_pressures):
+                    self.live_dut_pressure_history[i].append(dut_pressure)
+                    self.manual_trace_duts[i].append(dut_pressure)
 
-            if self.is_calibrating:
-                self.debug_full_time.append(current_time)
-                self.debug_full_std_pressure.append(std_pressure)
-                self.debug_full_inlet_pos.append(inlet_pos)
-                self.debug_full_outlet_pos.append(outlet_pos)
+                if self.is_calibrating:
+                    row = self._debug_trace[self._debug_head]
+                    row[:4] = (current_time, std_pressure, inlet_pos, outlet_pos) # None is stored as NaN
+                    row[4:] = dut_pressures
+                    self._debug_head = (self._debug_head + 1) % _DEBUG_TRACE_LEN
+                    if self._debug_count < _DEBUG_TRACE_LEN: self._debug_count += 1
+
+            # Readouts and plots render once per drain from the newest sample, however many arrived.
+            # A multi-sample batch refits the y-limits, since only the newest sample is checked otherwise.
+            batched = len(samples) > 1
+            if std_pressure is not None:
+                self._set_if_changed(self.live_pressure_var, f"{std_pressure:.3f} Torr")
+            else:
+                self._set_if_changed(self.live_pressure_var, "---.-- Torr")
 
             try:
                 display_inlet_pos = 100.0 - inlet_pos if inlet_pos is not None else 0.0
                 display_outlet_pos = outlet_pos if outlet_pos is not None else 0.0
-                self.inlet_pos_var.set(f"{display_inlet_pos:.1f} %")
-                self.outlet_pos_var.set(f"{display_outlet_pos:.1f} %")
-                self._draw_valve(self.ax_inlet_valve, display_inlet_pos)
-                self._draw_valve(self.ax_outlet_valve, display_outlet_pos)
+                self._set_if_changed(self.inlet_pos_var, f"{display_inlet_pos:.1f} %")
+                self._set_if_changed(self.outlet_pos_var, f"{display_outlet_pos:.1f} %")
+                self._update_valve('inlet', display_inlet_pos)
+                self._update_valve('outlet', display_outlet_pos)
             except Exception:
                 pass
-            
-            for i in range(4):
-                is_active = any(d['channel'] == i for d in self.active_duts)
-                dut_pressure = np.nan
-                if is_active:
-                    voltage = self.daq.read_voltage(i) if self.daq else None
-                    if voltage is not None:
-                        fs = [d['fs'] for d in self.active_duts if d['channel'] == i][0]
-                        dut_pressure = voltage * (fs / 9.9)
-                
-                self.live_dut_pressure_history[i].append(dut_pressure)
-                self.manual_trace_duts[i].append(dut_pressure)
-                if self.is_calibrating:
-                    self.debug_full_dut_pressure[i].append(dut_pressure)
-
-            self.live_std_plot.set_data(self.live_time_history, self.live_std_pressure_history)
-            for i, line in self.live_dut_plots.items():
-                line.set_visible(any(d['channel'] == i for d in self.active_duts))
-                line.set_data(self.live_time_history, self.live_dut_pressure_history[i])
-            t_max_main = self.live_time_history[-1] if self.live_time_history else 0
-            self.ax_live_pressure.set_xlim(max(0, t_max_main - 90), t_max_main + 1)
-            self.ax_live_pressure.relim(); self.ax_live_pressure.autoscale_view(scaley=True)
-            self.canvas.draw_idle()
-
-            if hasattr(self, 'manual_frame'): 
+
+            # Only the plot that is on screen gets its artists and limits updated.
+            if not self._manual_view_active:
+                t_view = self.live_time_history.view()
+                self.live_std_plot.set_data(t_view, self.live_std_pressure_history.view())
+                for ch in self._dut_channels: # Inactive lines were hidden in configure_plots
+                    self.live_dut_plots[ch].set_data(t_view, self.live_dut_pressure_history[ch].view())
+                t_max_main = self.live_time_history[-1] if self.live_time_history else 0
+                live_series = [self.live_std_pressure_history] + [self.live_dut_pressure_history[ch] for ch in self._dut_channels]
+                if self._update_trace_limits(self.ax_live_pressure, t_max_main, 90, live_series, refit=self._live_view_stale or batched):
+                    self.canvas.draw_idle()
+                else:
+                    self.live_blit.update()
+                self._live_view_stale = False
+            else:
                 t_max_manual = self.manual_trace_time[-1] if self.manual_trace_time else 0
                 
-                for i, plot_data in enumerate(self.manual_quadrant_lines):
-                    ax = plot_data['ax']
-                    if ax.get_visible():
-                        lines = self.manual_quadrant_lines[i]
-                        lines['std'].set_data(self.manual_trace_time, self.manual_trace_std)
-                        lines['dut'].set_data(self.manual_trace_time, self.manual_trace_duts[i])
-                        ax.relim()
-                        ax.autoscale_view(scaley=True)
-                self.axs_manual_quad.flat[0].set_xlim(max(0, t_max_manual - 30), t_max_manual + 1)
-                self.manual_quad_canvas.draw_idle()
-
+                t_view = self.manual_trace_time.view()
+                std_view = self.manual_trace_std.view()
                 ch = self.manual_focus_channel
-                if ch is not None:
-                    self.manual_single_lines['std'].set_data(self.manual_trace_time, self.manual_trace_std)
-                    self.manual_single_lines['dut'].set_data(self.manual_trace_time, self.manual_trace_duts[ch])
-                    self.ax_manual_single.set_xlim(max(0, t_max_manual - 30), t_max_manual + 1)
-                    self.ax_manual_single.relim(); self.ax_manual_single.autoscale_view(scaley=True)
-                    self.manual_single_canvas.draw_idle()
+                if ch is None:
+                    # Quadrant axes share x, so the first one's scroll step moves them all.
+                    needs_draw = False
+                    for i, plot_data in enumerate(self.manual_quadrant_lines):
+                        ax = plot_data['ax']
+                        if ax.get_visible():
+                            plot_data['std'].set_data(t_view, std_view)
+                            plot_data['dut'].set_data(t_view, self.manual_trace_duts[i].view())
+                            needs_draw |= self._update_trace_limits(ax, t_max_manual, 30, [self.manual_trace_std, self.manual_trace_duts[i]], refit=batched)
+                    if needs_draw: self.manual_quad_canvas.draw_idle()
+                    else: self.manual_quad_blit.update()
+                else:
+                    self.manual_single_lines['std'].set_data(t_view, std_view)
+                    self.manual_single_lines['dut'].set_data(t_view, self.manual_trace_duts[ch].view())
+                    if self._update_trace_limits(self.ax_manual_single, t_max_manual, 30, [self.manual_trace_std, self.manual_trace_duts[ch]], refit=batched):
+                        self.manual_single_canvas.draw_idle()
+                    else:
+                        self.manual_single_blit.update()
 
-        self.after_id = self.after(200, self.periodic_update)
+        self.after_id = self.after(33, self.periodic_update)
 
     def toggle_manual_mode(self):
         self.is_in_manual_mode = not self.is_in_manual_mode
@@ -828,7 +1197,7 @@ class CalibrationGUI(tk.Tk):
                 current_pressure = self.state_controller.current_pressure
                 if current_pressure is None: continue
 
-                is_stable = statistics.stdev(history) < (self.standard_fs_value * 0.0003)
+                is_stable = self.state_controller._std_pressure() < (self.standard_fs_value * 0.0003)
                 is_on_target = abs(current_pressure - self.manual_learn_target) < (self.standard_fs_value * 0.0015)
                 is_stable_now = is_stable and is_on_target
 
@@ -840,23 +1209,18 @@ class CalibrationGUI(tk.Tk):
 
                     if pos is not None and sp > 0:
                         sp_key = round(sp, 3)
-                        if sp_key not in self.learned_outlet_positions:
-                            self.learned_outlet_positions[sp_key] = []
-                        
-                        self.learned_outlet_positions[sp_key].append(pos)
-                        
-                        if len(self.learned_outlet_positions[sp_key]) > 10:
-                            self.learned_outlet_positions[sp_key] = self.learned_outlet_positions[sp_key][-10:]
-                        
-                        self.log_message(f"Auto-learned manual point for {sp_key:.3f} Torr. Now have {len(self.learned_outlet_positions[sp_key])} data point(s).")
+                        n_points = self._learn_outlet_position(sp_key, pos)
+                        self.log_message(f"Auto-learned manual point for {sp_key:.3f} Torr. Now have {n_points} data point(s).")
                         self.manual_point_learned.set()
+                        self._save_learned_data() # Persist now so the point survives a crash or power loss
                 
                 self.last_manual_stability_state = is_stable_now
-            except (statistics.StatisticsError, TypeError):
+            except (ValueError, TypeError):
                 continue
 
     def setup_manual_display(self):
         self.canvas.get_tk_widget().grid_remove()
+        self._manual_view_active = True
         self.manual_frame = tk.Frame(self.plot_term_frame)
         self.manual_frame.grid(row=0, column=0, sticky="nsew")
 
@@ -896,7 +1260,7 @@ class CalibrationGUI(tk.Tk):
         device_list_frame.pack(pady=10, fill='both', expand=True, anchor='n')
         
         tk.Radiobutton(device_list_frame, text=f"Standard ({self.standard_fs_value} Torr FS)", variable=self.manual_focus_device, 
-                        value="std", command=self.on_manual_focus_change, anchor='w').pack(fill='x')
+                        value="std", command=lambda: self._switch_focus(None, self.standard_fs_value), anchor='w').pack(fill='x')
 
         for dut in self.active_duts:
             ch, fs = dut['channel'], dut['fs']
@@ -904,7 +1268,7 @@ class CalibrationGUI(tk.Tk):
             frame.pack(fill="x", expand=True, padx=5, pady=5)
             
             tk.Radiobutton(frame, text=f"Focus on DUT {ch+1} ({fs} Torr FS)", variable=self.manual_focus_device, 
-                            value=f"ch{ch}", command=self.on_manual_focus_change).pack(side=tk.LEFT, padx=5)
+                            value=f"ch{ch}", command=lambda ch=ch, fs=fs: self._switch_focus(ch, fs)).pack(side=tk.LEFT, padx=5)
             
         self.manual_plot_panel = tk.Frame(self.manual_frame)
         self.manual_plot_panel.grid(row=0, column=1, sticky="nsew", padx=10, pady=10)
@@ -921,39 +1285,42 @@ class CalibrationGUI(tk.Tk):
             self.manual_quadrant_lines.append({'std': std_line, 'dut': dut_line, 'ax': ax})
         self.manual_quad_fig.tight_layout()
         self.manual_quad_canvas = FigureCanvasTkAgg(self.manual_quad_fig, master=self.manual_plot_panel)
+        self.manual_quad_blit = BlitManager(self.manual_quad_canvas, [l for d in self.manual_quadrant_lines for l in (d['std'], d['dut'])])
 
         # Create Single plot for individual DUT focus
         self.manual_single_fig, self.ax_manual_single = plt.subplots(figsize=(9, 7))
-        std_line, = self.ax_manual_single.plot([], [], 'b-', label='Standard', linewidth=2)
+        std_line, = self.ax_manual_single.plot([], [], 'b-', label='Standard', linewidth=1)
         dut_line, = self.ax_manual_single.plot([], [], 'g-', label='Focused DUT')
         self.manual_single_lines = {'std': std_line, 'dut': dut_line}
         self.ax_manual_single.grid(True)
         self.ax_manual_single.legend()
         self.manual_single_canvas = FigureCanvasTkAgg(self.manual_single_fig, master=self.manual_plot_panel)
+        self.manual_single_blit = BlitManager(self.manual_single_canvas, self.manual_single_lines.values())
         
+        self._switch_focus(None, self.standard_fs_value)
+
+    def _switch_focus(self, ch, fs):
+        # Channel and FS are bound into each radio button's command when the panel is built.
+        self.manual_focus_channel = ch
+        self._manual_focus_fs = fs
         self.on_manual_focus_change()
 
     def on_manual_focus_change(self):
-        focus_id = self.manual_focus_device.get()
+        ch = self.manual_focus_channel
         self.manual_trace_time.clear()
         self.manual_trace_std.clear()
         for i in range(4): self.manual_trace_duts[i].clear()
 
-        if focus_id == 'std':
-            self.manual_focus_channel = None
+        if ch is None:
             self.log_message(f"Manual control focus set to Standard (Quadrant View).")
             self.manual_single_canvas.get_tk_widget().pack_forget()
             self.manual_quad_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
             for i, plot_data in enumerate(self.manual_quadrant_lines):
-                is_active = any(d['channel'] == i for d in self.active_duts)
-                plot_data['ax'].set_visible(is_active)
+                plot_data['ax'].set_visible(self._dut_active_mask[i])
             self.manual_quad_canvas.draw_idle()
         else:
-            ch = int(focus_id.replace('ch',''))
-            self.manual_focus_channel = ch
-            fs = [d['fs'] for d in self.active_duts if d['channel'] == ch][0]
-            self.log_message(f"Manual control focus set to DUT {ch+1} ({fs} Torr).")
+            self.log_message(f"Manual control focus set to DUT {ch+1} ({self._manual_focus_fs} Torr).")
             self.manual_quad_canvas.get_tk_widget().pack_forget()
             self.manual_single_canvas.get_tk_widget().pack(fill=tk.BOTH, expand=True)
 
@@ -976,111 +1343,130 @@ class CalibrationGUI(tk.Tk):
             self.last_manual_stability_state = False
             
             predicted_pos = self._predict_outlet_position(pressure)
-            threading.Thread(target=self.state_controller.set_pressure, args=(pressure, predicted_pos), daemon=True).start()
+            self._setp_pool.submit(self.state_controller.set_pressure, pressure, predicted_pos)
             self.manual_setpoint_var.set(f"Current Setpoint: {pressure:.3f} Torr")
         except ValueError:
             messagebox.showerror("Invalid Input", "Please enter a valid number for the pressure.")
 
     def set_manual_pressure(self, fs_fraction):
-        focus_id = self.manual_focus_device.get()
-        target_fs = self.standard_fs_value
-
-        if focus_id != "std":
-            ch = int(focus_id.replace('ch',''))
-            target_fs = [d['fs'] for d in self.active_duts if d['channel'] == ch][0]
-        
-        pressure = target_fs * fs_fraction
+        pressure = self._manual_focus_fs * fs_fraction
         
         self.manual_learn_target = pressure
         self.manual_point_learned.clear()
         self.last_manual_stability_state = False
         
         predicted_pos = self._predict_outlet_position(pressure)
-        threading.Thread(target=self.state_controller.set_pressure, args=(pressure, predicted_pos), daemon=True).start()
+        self._setp_pool.submit(self.state_controller.set_pressure, pressure, predicted_pos)
         self.manual_setpoint_var.set(f"Current Setpoint: {pressure:.3f} Torr")
 
     def teardown_manual_display(self):
         if hasattr(self, 'manual_frame'): self.manual_frame.destroy()
+        self._manual_view_active = False
+        self._live_view_stale = True
         self.canvas.get_tk_widget().grid()
     
     def start_calibration_thread(self):
         self.is_calibrating = True
         
-        self.debug_full_time.clear()
-        self.debug_full_std_pressure.clear()
-        self.debug_full_inlet_pos.clear()
-        self.debug_full_outlet_pos.clear()
-        for i in range(4):
-            self.debug_full_dut_pressure[i].clear()
+        self._debug_head = 0
+        self._debug_count = 0
         
         self.log_message("\n--- Starting Automated Data Logging ---")
         self.data_storage = {'Setpoint_Torr': [], 'Standard_Pressure_Torr': []}
         for dut in self.active_duts:
             self.data_storage[f'Device_{dut["channel"]+1}_Pressure_Torr'] = []
         self.error_plot_data.clear()
+        self._error_bars.clear(); self._error_bar_height = None
         
         self.start_button.config(state=tk.DISABLED); self.manual_cal_button.config(state=tk.DISABLED)
         self.e_stop_button.config(state=tk.NORMAL)
         threading.Thread(target=self.run_calibration, daemon=True).start()
     
+    def _learn_outlet_position(self, sp_key, pos):
+        """Records a settled outlet position for a setpoint and keeps the prediction arrays current."""
+        history = self.learned_outlet_positions.get(sp_key)
+        if history is None:
+            history = self.learned_outlet_positions[sp_key] = collections.deque(maxlen=10)
+        history.append(pos)
+        self._learned_dirty = True
+
+        # Bump the version only once the arrays hold the new mean, so a predictor on
+        # another thread can't cache a stale result under the new version.
+        _, avg_positions, index = self._prediction_arrays
+        if sp_key in index: # Known setpoint: refresh its mean in place
+            avg_positions[index[sp_key]] = sum(history) / len(history)
+            self._learned_version += 1
+        else:
+            self._rebuild_prediction_arrays() # Bumps the version itself
+        return len(history)
+
+    def _rebuild_prediction_arrays(self):
+        # Sorted setpoints, their mean learned positions, and setpoint -> row, swapped in as one tuple.
+        known = sorted((float(sp), sum(h) / len(h)) for sp, h in self.learned_outlet_positions.items() if h)
+        sp_keys = np.array([sp for sp, _ in known])
+        avg_positions = np.array([avg for _, avg in known])
+        self._prediction_arrays = (sp_keys, avg_positions, {sp: i for i, (sp, _) in enumerate(known)})
+        self._learned_version += 1
+
     def _predict_outlet_position(self, target_sp):
         """Averages historical data and interpolates to predict the best outlet position."""
-        if not self.learned_outlet_positions:
-            return None
-
-        avg_positions = {}
-        for sp, pos_list in self.learned_outlet_positions.items():
-            if pos_list and isinstance(pos_list, list):
-                avg_positions[float(sp)] = sum(pos_list) / len(pos_list)
-        
-        if not avg_positions:
+        version = self._learned_version
+        last_sp, last_result, last_version = self._predict_cache
+        if target_sp == last_sp and last_version == version:
+            return last_result
+        result = self._interpolate_outlet_position(target_sp)
+        self._predict_cache = (target_sp, result, version)
+        return result
+
+    def _interpolate_outlet_position(self, target_sp):
+        sp_keys, avg_positions, _ = self._prediction_arrays
+        n = sp_keys.size
+        if n == 0:
             return None
 
-        known_sps = sorted(avg_positions.keys())
+        idx = int(np.searchsorted(sp_keys, target_sp))
+        if idx < n and sp_keys[idx] == target_sp:
+            return float(avg_positions[idx])
 
-        if target_sp in known_sps:
-            return avg_positions[target_sp]
+        if n < 2:
+            return float(avg_positions[0])
 
-        if len(known_sps) < 2:
-            closest_sp = min(known_sps, key=lambda sp: abs(sp - target_sp))
-            return avg_positions[closest_sp]
-
-        if target_sp < known_sps[0]:
-            sp1, sp2 = known_sps[0], known_sps[1]
-        elif target_sp > known_sps[-1]:
-            sp1, sp2 = known_sps[-2], known_sps[-1]
-        else:
-            sp_high = min(sp for sp in known_sps if sp > target_sp)
-            sp_low = max(sp for sp in known_sps if sp < target_sp)
-            sp1, sp2 = sp_low, sp_high
-
-        pos1 = avg_positions[sp1]
-        pos2 = avg_positions[sp2]
-
-        if sp2 == sp1: return pos1
+        # Outside the learned range this extrapolates from the two nearest setpoints.
+        idx = min(max(idx, 1), n - 1)
+        sp1, sp2 = sp_keys[idx - 1], sp_keys[idx]
+        pos1, pos2 = avg_positions[idx - 1], avg_positions[idx]
 
         fraction = (target_sp - sp1) / (sp2 - sp1)
         predicted_pos = pos1 + fraction * (pos2 - pos1)
-        return predicted_pos
+        return float(predicted_pos)
+
+    def _wait_for_sample(self, timeout):
+        # Wakes as soon as the polling thread records a new pressure, or after timeout regardless.
+        sample_event = self.state_controller.sample_event
+        sample_event.wait(timeout)
+        sample_event.clear()
 
     def run_calibration(self):
         run_start_time = time.time()
         try:
-            master_setpoints = set()
-            for i in range(0, 101, 10): master_setpoints.add(round(self.standard_fs_value * i / 100, 2))
-            for dut in self.active_duts:
-                for i in range(0, 101, 10): master_setpoints.add(round(dut['fs'] * i / 100, 2))
-            
-            setpoints = sorted(list(master_setpoints))
+            # 0-100% of each full scale in 10% steps; np.unique merges and sorts the composite list.
+            pct = np.arange(0, 101, 10) / 100
+            dut_specific_setpoints = {dut['channel']: np.round(dut['fs'] * pct, 2).tolist() for dut in self.active_duts}
+            setpoints = np.unique(np.concatenate([np.round(self.standard_fs_value * pct, 2),
+                                                  *dut_specific_setpoints.values()])).tolist()
             self.log_message(f"Generated composite setpoints: {setpoints}")
 
             self.after(0, self._setup_error_plot, setpoints)
 
-            dut_specific_setpoints = {
-                dut['channel']: {round(dut['fs'] * i / 100, 2) for i in range(0, 101, 10)}
-                for dut in self.active_duts
-            }
+            # Per setpoint, resolved once up front: the channels that own it and the tightest of their tolerances.
+            setpoint_tolerances = {}
+            setpoint_channels = collections.defaultdict(set)
+            for dut in self.active_duts:
+                for sp in dut_specific_setpoints[dut['channel']]:
+                    setpoint_tolerances[sp] = min(setpoint_tolerances.get(sp, np.inf), dut['fs'] * 0.005)
+                    setpoint_channels[sp].add(dut['channel'])
             
+            learned_since_save = 0
             for sp in setpoints:
                 if not self.is_calibrating: break
                 setpoint_start_time = time.time()
@@ -1094,15 +1480,22 @@ class CalibrationGUI(tk.Tk):
                 stability_confirmed_time = None
                 out_of_tolerance_start_time = None
 
-                relevant_duts = [d for d in self.active_duts if sp in dut_specific_setpoints.get(d['channel'], set())]
-                priority_tolerance = min([d['fs'] * 0.005 for d in relevant_duts]) if relevant_duts else self.standard_fs_value * 0.005
+                priority_tolerance = setpoint_tolerances.get(sp, self.standard_fs_value * 0.005)
+                sp_channels = setpoint_channels.get(sp, ())
+                last_seen_sample = -1
 
                 while self.is_calibrating:
                     if len(self.state_controller.pressure_history) < 10:
-                        time.sleep(0.5)
+                        self._wait_for_sample(0.5)
+                        continue
+
+                    sample_count = self.state_controller.sample_counter
+                    if sample_count == last_seen_sample: # Nothing new since the last check
+                        self._wait_for_sample(0.5)
                         continue
+                    last_seen_sample = sample_count
 
-                    is_stable = statistics.stdev(self.state_controller.pressure_history) < (self.standard_fs_value * 0.0002)
+                    is_stable = self.state_controller._std_pressure() < (self.standard_fs_value * 0.0002)
                     stable_pressure = self.state_controller.current_pressure
                     
                     if stable_pressure is None:
@@ -1132,25 +1525,20 @@ class CalibrationGUI(tk.Tk):
                     else:
                         stability_confirmed_time = None; out_of_tolerance_start_time = None
                     
-                    time.sleep(0.5)
+                    self._wait_for_sample(0.5)
                 
                 if not self.is_calibrating: continue
                 
                 self.log_message(f"  Starting 5s data log. Locking outlet valve.")
                 self.state_controller.hold_outlet_valve = True
                 
+                # The standard and DUT rings are appended together, one row per 200 ms sample, so
+                # the samples taken during the window are simply the newest (end - start) of each.
                 log_start_time = time.time()
-                standard_readings = []
-                dut_readings = {dut['channel']: [] for dut in self.active_duts}
-                
+                window_start = self.live_std_pressure_history.appended
                 while (time.time() - log_start_time) < 5.0 and self.is_calibrating:
-                    if self.state_controller.current_pressure is not None:
-                        standard_readings.append(self.state_controller.current_pressure)
-                    for dut in self.active_duts:
-                        ch = dut['channel']
-                        if self.live_dut_pressure_history[ch] and not np.isnan(self.live_dut_pressure_history[ch][-1]):
-                            dut_readings[ch].append(self.live_dut_pressure_history[ch][-1])
                     time.sleep(0.2)
+                window_len = self.live_std_pressure_history.appended - window_start
 
                 self.state_controller.hold_outlet_valve = False
                 self.log_message(f"  Data log complete. Unlocking outlet valve.")
@@ -1158,21 +1546,19 @@ class CalibrationGUI(tk.Tk):
                 if not self.is_calibrating: continue
 
                 log_completion_time = time.time() - self.start_time
-                mean_standard = np.mean(standard_readings) if standard_readings else np.nan
+                mean_standard = _finite_mean(self.live_std_pressure_history.tail(window_len))
+                dut_means = {ch: _finite_mean(self.live_dut_pressure_history[ch].tail(window_len)) for ch in self._dut_channels}
                 if np.isnan(mean_standard): continue
 
                 current_outlet_pos = self.state_controller.outlet_valve_pos
                 if current_outlet_pos is not None:
                     sp_key = round(sp, 3)
-                    if sp_key not in self.learned_outlet_positions:
-                        self.learned_outlet_positions[sp_key] = []
-                    
-                    self.learned_outlet_positions[sp_key].append(current_outlet_pos)
-                    
-                    if len(self.learned_outlet_positions[sp_key]) > 10:
-                        self.learned_outlet_positions[sp_key] = self.learned_outlet_positions[sp_key][-10:]
-                    
-                    self.log_message(f"  Updated history for {sp_key:.3f} Torr. Now have {len(self.learned_outlet_positions[sp_key])} data point(s).")
+                    n_points = self._learn_outlet_position(sp_key, current_outlet_pos)
+                    self.log_message(f"  Updated history for {sp_key:.3f} Torr. Now have {n_points} data point(s).")
+                    learned_since_save += 1
+                    if learned_since_save >= 10: # Checkpoint long runs; the end of the run saves the rest
+                        self._save_learned_data()
+                        learned_since_save = 0
 
                 self.data_storage['Setpoint_Torr'].append(sp)
                 self.data_storage['Standard_Pressure_Torr'].append(mean_standard)
@@ -1182,12 +1568,12 @@ class CalibrationGUI(tk.Tk):
 
                 for dut in self.active_duts:
                     ch, fs = dut['channel'], dut['fs']
-                    mean_dut = np.mean(dut_readings.get(ch, [])) if dut_readings.get(ch) else np.nan
+                    mean_dut = dut_means[ch]
                     self.data_storage[f'Device_{ch+1}_Pressure_Torr'].append(mean_dut)
                     if not np.isnan(mean_dut):
                         log_line += f" | Dev {ch+1} (Avg): {mean_dut:.3f} Torr"
                         
-                        if sp in dut_specific_setpoints.get(ch, set()):
+                        if ch in sp_channels:
                             error = mean_dut - mean_standard
                             if sp not in self.error_plot_data: self.error_plot_data[sp] = {}
                             self.error_plot_data[sp][ch] = {'error': error, 'time': log_completion_time}
@@ -1204,8 +1590,12 @@ class CalibrationGUI(tk.Tk):
             if self.is_calibrating:
                 total_duration = time.time() - run_start_time
                 self.log_message(f"\n--- Data Logging Complete in {total_duration:.1f} seconds. Saving data... ---")
-                df = pd.DataFrame(self.data_storage)
-                df.to_csv("calibration_results.csv", index=False)
+                columns = list(self.data_storage)
+                with open("calibration_results.csv", 'w', newline='', buffering=1 << 16) as f:
+                    writer = csv.writer(f, lineterminator="\n")
+                    writer.writerow(columns)
+                    # NaN cells are left empty, matching what DataFrame.to_csv wrote.
+                    writer.writerows([('' if v != v else v) for v in row] for row in zip(*self.data_storage.values()))
                 self.log_message("Data saved to 'calibration_results.csv'.")
                 self._save_learned_data()
 
@@ -1227,29 +1617,43 @@ class CalibrationGUI(tk.Tk):
         if not self.state_controller or not hasattr(self, 'standard_fs_value'):
             self.log_message("Cannot save learning data: System not fully initialized.")
             return
-        try:
-            fs_key = str(self.standard_fs_value)
-            self.learned_data[fs_key] = {str(k): v for k, v in self.learned_outlet_positions.items()}
-            with open(self.learned_positions_file, 'w') as f:
-                json.dump(self.learned_data, f, indent=4)
-            self.log_message(f"Saved {len(self.learned_outlet_positions)} learned points for {fs_key} Torr FS.")
-        except Exception as e:
-            self.log_message(f"ERROR: Could not save learned positions: {e}")
+        with self._learned_save_lock:
+            if not self._learned_dirty: return # Nothing learned since the last save
+            try:
+                fs_key = str(self.standard_fs_value)
+                self._learned_dirty = False
+                self.learned_data[fs_key] = {str(k): list(v) for k, v in self.learned_outlet_positions.items()}
+                # Write a temp file and swap it in so a crash mid-write never truncates the profile.
+                tmp_path = self.learned_positions_file + '.tmp'
+                with open(tmp_path, 'w') as f:
+                    json.dump(self.learned_data, f, separators=(',', ':'))
+                os.replace(tmp_path, self.learned_positions_file)
+                self.log_message(f"Saved {len(self.learned_outlet_positions)} learned points for {fs_key} Torr FS.")
+            except Exception as e:
+                self._learned_dirty = True
+                self.log_message(f"ERROR: Could not save learned positions: {e}")
 
     def _generate_debug_plot(self):
         """Creates and saves a detailed plot of the entire calibration run."""
         self.log_message("Generating full-run debug plot...")
         try:
+            if self._debug_count < _DEBUG_TRACE_LEN:
+                trace = self._debug_trace[:self._debug_count]
+            else: # Wrapped: oldest row sits at the write head
+                trace = np.roll(self._debug_trace, -self._debug_head, axis=0)
+            trace = trace[::max(1, len(trace) // 2000)] # ~2000 points is plenty at figure resolution
+            t = trace[:, 0]
+
             fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(16, 10), sharex=True)
             fig.suptitle('Full Calibration Run - Debug Trace', fontsize=16)
 
             ax1.set_title('Pressure vs. Time')
             ax1.set_ylabel('Pressure (Torr)')
             ax1.grid(True, linestyle=':')
-            ax1.plot(self.debug_full_time, self.debug_full_std_pressure, label='Standard', color='blue', linewidth=2)
+            ax1.plot(t, trace[:, 1], label='Standard', color='blue', linewidth=2)
             for i, dut in enumerate(self.active_duts):
                 ch = dut['channel']
-                ax1.plot(self.debug_full_time, self.debug_full_dut_pressure[ch], label=f'DUT {ch+1}', color=self.dut_colors[ch], alpha=0.8)
+                ax1.plot(t, trace[:, 4 + ch], label=f'DUT {ch+1}', color=self.dut_colors[ch], alpha=0.8)
             ax1.legend()
 
             ax2.set_title('Valve Position vs. Time')
@@ -1258,10 +1662,8 @@ class CalibrationGUI(tk.Tk):
             ax2.grid(True, linestyle=':')
             ax2.set_ylim(-5, 105)
             
-            inlet_openness = [100 - pos if pos is not None else np.nan for pos in self.debug_full_inlet_pos]
-            outlet_openness = [pos if pos is not None else np.nan for pos in self.debug_full_outlet_pos]
-            ax2.plot(self.debug_full_time, inlet_openness, label='Inlet Valve (% Open)', color='green', linestyle='--')
-            ax2.plot(self.debug_full_time, outlet_openness, label='Outlet Valve (% Open)', color='red', linestyle=':')
+            ax2.plot(t, 100 - trace[:, 2], label='Inlet Valve (% Open)', color='green', linestyle='--')
+            ax2.plot(t, trace[:, 3], label='Outlet Valve (% Open)', color='red', linestyle=':')
             ax2.legend()
             
             plt.tight_layout(rect=[0, 0, 1, 0.96])
@@ -1284,28 +1686,24 @@ class CalibrationGUI(tk.Tk):
         suggestion_parts = ["--- Post-Calibration Tuning Analysis ---"]
         any_suggestions = False
 
+        std_all = np.asarray(self.data_storage['Standard_Pressure_Torr'], dtype=float)
+        std_valid = ~np.isnan(std_all)
         for dut in self.active_duts:
             ch, fs = dut['channel'], dut['fs']
-            std_points = np.array([s for s, d in zip(self.data_storage['Standard_Pressure_Torr'], self.data_storage[f'Device_{ch+1}_Pressure_Torr']) if not np.isnan(d) and not np.isnan(s)])
-            dut_points = np.array([d for s, d in zip(self.data_storage['Standard_Pressure_Torr'], self.data_storage[f'Device_{ch+1}_Pressure_Torr']) if not np.isnan(d) and not np.isnan(s)])
+            dut_all = np.asarray(self.data_storage[f'Device_{ch+1}_Pressure_Torr'], dtype=float)
+            mask = std_valid & ~np.isnan(dut_all)
+            std_points, dut_points = std_all[mask], dut_all[mask]
             if len(dut_points) < 3: continue
 
-            slope, intercept = np.polyfit(std_points, dut_points, 1)
+            slope, intercept = _linfit(std_points, dut_points)
             zero_offset_is_sig = abs(intercept) > (fs * 0.001)
             span_error_is_sig = abs(1.0 - slope) > 0.005
             
-            non_linearity_points = []
-            for std_p, dut_p in zip(std_points, dut_points):
-                linear_p = slope * std_p + intercept
-                non_linearity_points.append(dut_p - linear_p)
-            
-            if non_linearity_points:
-                max_non_linearity = max(np.abs(non_linearity_points))
-                linearity_is_sig = max_non_linearity > (fs * 0.002)
-                mid_idx = np.abs(np.array(non_linearity_points)).argmax()
-                midpoint_error_from_line = non_linearity_points[mid_idx]
-            else:
-                linearity_is_sig = False
+            non_linearity_points = dut_points - (slope * std_points + intercept)
+            abs_non_linearity = np.abs(non_linearity_points)
+            mid_idx = abs_non_linearity.argmax()
+            linearity_is_sig = abs_non_linearity[mid_idx] > (fs * 0.002)
+            midpoint_error_from_line = non_linearity_points[mid_idx]
 
             if not (zero_offset_is_sig or span_error_is_sig or linearity_is_sig):
                 suggestion_parts.append(f"\n--- Analysis for DUT {ch+1} ({fs} Torr FS) ---")
@@ -1313,20 +1711,21 @@ class CalibrationGUI(tk.Tk):
                 continue
 
             any_suggestions = True
-            suggestion_parts.append(f"\n--- Suggestions for DUT {ch+1} ({fs} Torr FS) ---")
-            suggestion_parts.append(f"\n[ DIAGNOSIS ]\ny = {slope:.4f}x + {intercept:+.4f}")
-            if zero_offset_is_sig: suggestion_parts.append(f" • ZERO OFFSET ERROR: {intercept:+.4f} Torr.")
-            if span_error_is_sig: suggestion_parts.append(f" • SPAN (GAIN) ERROR: Gain is {'too high' if slope > 1 else 'too low'} (Slope={slope:.4f}).")
-            if linearity_is_sig: suggestion_parts.append(f" • LINEARITY ERROR: Mid-range response {'bows UP' if midpoint_error_from_line > 0 else 'bows DOWN'}.")
-
-            suggestion_parts.append("\n[ RECOMMENDED ADJUSTMENT PLAN ]")
-            suggestion_parts.append("\n1. ADJUST ZERO (0% FS)")
-            if zero_offset_is_sig: suggestion_parts.append(f"   ➡️ ACTION: Adjust to {'LOWER' if intercept > 0 else 'RAISE'} the reading.")
-            suggestion_parts.append("\n2. ADJUST SPAN (100% FS)")
-            if span_error_is_sig: suggestion_parts.append(f"   ➡️ ACTION: Adjust to {'LOWER' if slope > 1 else 'RAISE'} the reading.")
-            suggestion_parts.append("\n3. RE-CHECK ZERO (Critical Step)")
-            suggestion_parts.append("\n4. ADJUST LINEARITY (50% FS)")
-            if linearity_is_sig: suggestion_parts.append(f"   ➡️ ACTION: Correct {'upward \"smiling\"' if midpoint_error_from_line > 0 else 'downward \"frowning\"'} bow.")
+            # Optional lines carry their own leading newline so the report is one template per DUT.
+            zero_diag = f"\n • ZERO OFFSET ERROR: {intercept:+.4f} Torr." if zero_offset_is_sig else ""
+            span_diag = f"\n • SPAN (GAIN) ERROR: Gain is {'too high' if slope > 1 else 'too low'} (Slope={slope:.4f})." if span_error_is_sig else ""
+            lin_diag = f"\n • LINEARITY ERROR: Mid-range response {'bows UP' if midpoint_error_from_line > 0 else 'bows DOWN'}." if linearity_is_sig else ""
+            zero_action = f"\n   ➡️ ACTION: Adjust to {'LOWER' if intercept > 0 else 'RAISE'} the reading." if zero_offset_is_sig else ""
+            span_action = f"\n   ➡️ ACTION: Adjust to {'LOWER' if slope > 1 else 'RAISE'} the reading." if span_error_is_sig else ""
+            lin_action = f"\n   ➡️ ACTION: Correct {'upward \"smiling\"' if midpoint_error_from_line > 0 else 'downward \"frowning\"'} bow." if linearity_is_sig else ""
+            suggestion_parts.append(
+                f"\n--- Suggestions for DUT {ch+1} ({fs} Torr FS) ---\n"
+                f"\n[ DIAGNOSIS ]\ny = {slope:.4f}x + {intercept:+.4f}{zero_diag}{span_diag}{lin_diag}\n"
+                f"\n[ RECOMMENDED ADJUSTMENT PLAN ]\n"
+                f"\n1. ADJUST ZERO (0% FS){zero_action}\n"
+                f"\n2. ADJUST SPAN (100% FS){span_action}\n"
+                f"\n3. RE-CHECK ZERO (Critical Step)\n"
+                f"\n4. ADJUST LINEARITY (50% FS){lin_action}")
         
         final_suggestion_text = "\n".join(suggestion_parts)
         self.log_message(final_suggestion_text)
@@ -1336,8 +1735,6 @@ class CalibrationGUI(tk.Tk):
         all_setpoints = sorted(self.error_plot_data.keys())
         if not all_setpoints:
             return
-            
-        self._setup_error_plot(all_setpoints)
         
         bar_height = 1.0
         num_duts = len(self.active_duts)
@@ -1347,23 +1744,54 @@ class CalibrationGUI(tk.Tk):
             bar_height = min(min_gap * 0.8, 2.0)
         
         bar_height /= num_duts
+
+        # Bars already on the axes are kept; only setpoints logged since the last call get new
+        # artists. The axes are rebuilt only when the bar layout changes or a new run started.
+        if bar_height != self._error_bar_height:
+            self._setup_error_plot(all_setpoints)
+            self._error_bars.clear()
+            self._error_bar_height = bar_height
+        else:
+            self.ax_error.set_ylim(all_setpoints[0] - 5, all_setpoints[-1] + 5)
         
         for i, dut in enumerate(self.active_duts):
             ch = dut['channel']
             offset = (i - (num_duts - 1) / 2) * bar_height
+            drawn = self._error_bars.setdefault(ch, {})
             
+            new_points, n_points = [], 0
             for sp, errors_data in self.error_plot_data.items():
-                if ch in errors_data:
-                    error_info = errors_data[ch]
-                    error_val = error_info['error']
-                    log_time = error_info['time']
-
-                    self.ax_error.barh(sp + offset, error_val, height=bar_height,
-                                       color=self.dut_colors[ch], edgecolor='black', linewidth=0.5)
-                    
+                entry = errors_data.get(ch)
+                if entry is None: continue
+                n_points += 1
+                old = drawn.get(sp)
+                if old is not None:
+                    if old[0] == entry['error']: continue
+                    old[1].remove() # Setpoint was revisited; replace its bar
+                    if old[2] is not None: old[2].remove()
+                new_points.append((sp, entry['error'], entry['time']))
+
+            show_labels = n_points <= 30 # Time labels would overlap into a smear on dense runs
+            if not show_labels:
+                for sp, (error_val, bar, label) in drawn.items():
+                    if label is not None:
+                        label.remove()
+                        drawn[sp] = (error_val, bar, None)
+            if not new_points: continue
+
+            sps, error_vals, log_times = zip(*new_points)
+            ys = np.array(sps) + offset
+            # One barh call per DUT for everything new; Matplotlib still makes a patch per bar.
+            bars = self.ax_error.barh(ys, error_vals, height=bar_height,
+                                      color=self.dut_colors[ch], edgecolor='black', linewidth=0.5)
+            
+            for sp, y, error_val, log_time, bar in zip(sps, ys, error_vals, log_times, bars):
+                label = None
+                if show_labels:
                     ha = 'left' if error_val >= 0 else 'right'
-                    self.ax_error.text(error_val, sp + offset, f" @{log_time:.1f}s",
-                                       va='center', ha=ha, fontsize=7, color='#555555')
+                    label = self.ax_error.text(error_val, y, f" @{log_time:.1f}s",
+                                               va='center', ha=ha, fontsize=7, color='#555555')
+                drawn[sp] = (error_val, bar, label)
         
         self.ax_error.relim()
         self.ax_error.autoscale_view(scalex=True, scaley=False)
@@ -1371,11 +1799,19 @@ class CalibrationGUI(tk.Tk):
 
     def on_closing(self):
         self.is_calibrating = False; self.is_in_manual_mode = False
+        self._sample_stop.set()
+        self._setp_pool.shutdown(wait=False, cancel_futures=True)
         self._save_learned_data()
         
         if self.after_id:
             self.after_cancel(self.after_id)
             self.after_id = None
+        if self.log_after_id:
+            self.after_cancel(self.log_after_id)
+            self.log_after_id = None
+        if self.com_scan_after_id:
+            self.after_cancel(self.com_scan_after_id)
+            self.com_scan_after_id = None
 
         if self.state_controller: self.state_controller.close()
         if self.daq: self.daq.close()
@@ -1,15 +1,23 @@
 # final/Auto_Cal_Logic.py
 import time
-import statistics
 import numpy as np
 import pandas as pd
 from tkinter import messagebox
 import tkinter as tk
 import threading
 import os
+import csv
 
 from Cert_Generator import generate_certificate
 
+def _window_mean(history, n):
+    """Mean of the non-NaN values among the newest n entries of a live history deque (None counts as NaN)."""
+    if n <= 0:
+        return np.nan
+    window = np.array(list(history)[-n:], dtype=float)
+    window = window[~np.isnan(window)]
+    return window.mean() if window.size else np.nan
+
 def run_calibration(app):
     """
     The main logic for the automated calibration sequence.
@@ -34,28 +42,55 @@ def run_calibration(app):
             return 
     # --- END NEW VALIDATION LOGIC ---
 
-    run_start_time = time.time()
+    monotonic = time.monotonic # Interval timing; immune to wall-clock adjustments
+    run_start_time = monotonic()
+    csv_file = None
+    logged_rows = None # Filled rows of the preallocated data_storage columns, once they exist
     try:
-        master_setpoints = set()
-        for i in range(0, 101, 10):
-            master_setpoints.add(round(app.standard_fs_value * i / 100, 2))
-        for dut in app.active_duts:
-            for i in range(0, 101, 10):
-                master_setpoints.add(round(dut['fs'] * i / 100, 2))
-        setpoints = sorted(list(master_setpoints))
+        # 0-100% of every full scale in 10% steps: row 0 is the standard, row k+1 the k-th DUT.
+        dut_fs = np.array([dut['fs'] for dut in app.active_duts], dtype=float)
+        grid = np.round(np.concatenate(([app.standard_fs_value], dut_fs))[:, None] * (np.arange(0, 101, 10) / 100), 2)
+        setpoints = np.unique(grid).tolist()
         app.log_message(f"Generated composite setpoints: {setpoints}")
 
         app.after(0, app._setup_error_plot, setpoints)
 
-        dut_specific_setpoints = {dut['channel']: {round(dut['fs'] * i / 100, 2) for i in range(0, 101, 10)} for dut in app.active_duts}
+        # owns_setpoint[i, k]: setpoint i is one of DUT k's own points. Each setpoint's stability
+        # tolerance is the tightest among its owners, or the standard's when no DUT owns it.
+        owns_setpoint = (np.array(setpoints)[:, None, None] == grid[None, 1:, :]).any(axis=2)
+        setpoint_tolerances = np.where(owns_setpoint, dut_fs * 0.005, np.inf).min(axis=1, initial=np.inf)
+        setpoint_tolerances[np.isinf(setpoint_tolerances)] = app.standard_fs_value * 0.005
+        dut_range_limits = dut_fs * 1.05
+        # Hoisted for the per-sample stability loop
+        sc = app.state_controller
+        wait_for_sample = sc.wait_for_sample
+        pressure_history = sc.pressure_history
+        stability_threshold = app.standard_fs_value * 0.0003
         
         app.completed_duts.clear()
 
-        for sp in setpoints:
+        # One NaN-filled slot per setpoint for every column the GUI set up; rows are written by
+        # index and the columns are trimmed to the rows actually logged once the loop ends.
+        storage_columns = list(app.data_storage)
+        app.data_storage = {col: np.full(len(setpoints), np.nan) for col in storage_columns}
+        logged_rows = 0
+
+        # Rows are streamed to a .partial file as each setpoint is logged (same columns as data_storage)
+        # and only replace the results CSV once the run completes, so an aborted run keeps the last good results.
+        output_dir = "Analysis"
+        os.makedirs(output_dir, exist_ok=True)
+        csv_output_path = os.path.join(output_dir, "calibration_results.csv")
+        csv_partial_path = csv_output_path + ".partial"
+        csv_file = open(csv_partial_path, 'w', newline='')
+        csv_writer = csv.writer(csv_file)
+        csv_writer.writerow(storage_columns)
+
+        for sp_idx, sp in enumerate(setpoints):
             if not app.is_calibrating: break
             
-            for dut in app.active_duts:
-                if sp > dut['fs'] * 1.05 and dut['channel'] not in app.completed_duts:
+            for idx in np.flatnonzero(sp > dut_range_limits):
+                dut = app.active_duts[idx]
+                if dut['channel'] not in app.completed_duts:
                     app.log_message(f"--- DUT {dut['channel']+1} ({dut['fs']} Torr) range completed. Hiding trace. ---")
                     app.completed_duts.add(dut['channel'])
 
@@ -63,29 +98,33 @@ def run_calibration(app):
                 app.log_message("All DUTs have completed their calibration ranges. Ending run early.")
                 break
 
-            setpoint_start_time = time.time()
+            setpoint_start_time = monotonic()
             app.log_message(f"\n--- Setting {sp} Torr ---")
             
             if sp == 0.0:
-                app.state_controller.set_pressure(sp)
+                sc.set_pressure(sp)
             else:
                 predicted_pos = app._predict_outlet_position(sp)
-                app.state_controller.set_pressure(sp, predicted_outlet_pos=predicted_pos)
+                sc.set_pressure(sp, predicted_outlet_pos=predicted_pos)
             
             app.log_message("Waiting for pressure to stabilize...")
 
             stability_confirmed_time = None
             out_of_tolerance_start_time = None
-            relevant_duts = [d for d in app.active_duts if sp in dut_specific_setpoints.get(d['channel'], set())]
-            priority_tolerance = min([d['fs'] * 0.005 for d in relevant_duts]) if relevant_duts else app.standard_fs_value * 0.005
+            priority_tolerance = setpoint_tolerances[sp_idx]
 
+            last_seen_sample = -1
             while app.is_calibrating:
-                if len(app.state_controller.pressure_history) < 10:
-                    time.sleep(0.5)
+                # Wake on each new pressure sample; the 0.5s timeout only lets is_calibrating be rechecked.
+                sample_count = wait_for_sample(last_seen_sample, 0.5)
+                if sample_count == last_seen_sample:
+                    continue
+                last_seen_sample = sample_count
+                if len(pressure_history) < 10:
                     continue
 
-                is_stable = statistics.stdev(app.state_controller.pressure_history) < (app.standard_fs_value * 0.0003)
-                stable_pressure = app.state_controller.current_pressure
+                is_stable = sc.pressure_stdev < stability_threshold
+                stable_pressure = sc.current_pressure
                 if stable_pressure is None:
                     time.sleep(1)
                     continue
@@ -93,8 +132,8 @@ def run_calibration(app):
                 if is_stable:
                     if abs(stable_pressure - sp) <= priority_tolerance:
                         out_of_tolerance_start_time = None
-                        if stability_confirmed_time is None: stability_confirmed_time = time.time()
-                        if (time.time() - stability_confirmed_time) >= 3.0:
+                        if stability_confirmed_time is None: stability_confirmed_time = monotonic()
+                        if (monotonic() - stability_confirmed_time) >= 3.0:
                             app.log_message(f"  Pressure locked at {stable_pressure:.3f} Torr. Proceeding to log.")
                             break
                     else:
@@ -102,8 +141,8 @@ def run_calibration(app):
                         if out_of_tolerance_start_time is None:
                             app.log_message(f"  Pressure stable at {stable_pressure:.3f} Torr, but OUTSIDE tolerance (+/- {priority_tolerance:.4f} Torr).")
                             app.log_message("  Waiting 20 seconds before prompting...")
-                            out_of_tolerance_start_time = time.time()
-                        elif (time.time() - out_of_tolerance_start_time) >= 20.0:
+                            out_of_tolerance_start_time = monotonic()
+                        elif (monotonic() - out_of_tolerance_start_time) >= 20.0:
                             if messagebox.askyesno("Out-of-Tolerance Override", f"Pressure is stable at {stable_pressure:.4f} Torr, but outside tolerance.\n\nAccept this reading?"):
                                 break
                             else:
@@ -111,32 +150,28 @@ def run_calibration(app):
                 else:
                     stability_confirmed_time = None
                     out_of_tolerance_start_time = None
-                time.sleep(0.5)
 
             if not app.is_calibrating: continue
 
             app.log_message("  Starting 5s data log. Locking outlet valve.")
-            app.state_controller.hold_outlet_valve = True
-            log_start_time = time.time()
-            standard_readings = []
-            dut_readings = {dut['channel']: [] for dut in app.active_duts}
-            while (time.time() - log_start_time) < 5.0 and app.is_calibrating:
-                if app.state_controller.current_pressure is not None:
-                    standard_readings.append(app.state_controller.current_pressure)
-                for dut in app.active_duts:
-                    ch = dut['channel']
-                    if app.live_dut_pressure_history[ch] and not np.isnan(app.live_dut_pressure_history[ch][-1]):
-                        dut_readings[ch].append(app.live_dut_pressure_history[ch][-1])
+            sc.hold_outlet_valve = True
+            # The GUI appends one row to every live history per update, so the window's samples
+            # are just the newest (end - start) entries of each; averaged once at the end.
+            log_start_time = monotonic()
+            window_start = app.live_sample_count
+            while (monotonic() - log_start_time) < 5.0 and app.is_calibrating:
                 time.sleep(0.2)
-            app.state_controller.hold_outlet_valve = False
+            window_len = app.live_sample_count - window_start
+            sc.hold_outlet_valve = False
             app.log_message("  Data log complete. Unlocking outlet valve.")
 
             if not app.is_calibrating: continue
 
-            mean_standard = np.mean(standard_readings) if standard_readings else np.nan
+            mean_standard = _window_mean(app.live_std_pressure_history, window_len)
             if np.isnan(mean_standard): continue
+            dut_means = {dut['channel']: _window_mean(app.live_dut_pressure_history[dut['channel']], window_len) for dut in app.active_duts}
 
-            current_outlet_pos = app.state_controller.outlet_valve_pos
+            current_outlet_pos = sc.outlet_valve_pos
             if current_outlet_pos is not None:
                 sp_key = round(sp, 3)
                 if sp_key not in app.learned_outlet_positions: app.learned_outlet_positions[sp_key] = []
@@ -144,18 +179,19 @@ def run_calibration(app):
                 if len(app.learned_outlet_positions[sp_key]) > 10: app.learned_outlet_positions[sp_key] = app.learned_outlet_positions[sp_key][-10:]
                 app.log_message(f"  Updated history for {sp_key:.3f} Torr. Now have {len(app.learned_outlet_positions[sp_key])} data point(s).")
 
-            app.data_storage['Setpoint_Torr'].append(sp)
-            app.data_storage['Standard_Pressure_Torr'].append(mean_standard)
-            log_line = f"  Logged -> Setpoint: {sp:.2f} | Standard (Avg): {mean_standard:.3f} Torr (took {time.time() - setpoint_start_time:.1f}s)"
+            row = logged_rows
+            app.data_storage['Setpoint_Torr'][row] = sp
+            app.data_storage['Standard_Pressure_Torr'][row] = mean_standard
+            log_line = f"  Logged -> Setpoint: {sp:.2f} | Standard (Avg): {mean_standard:.3f} Torr (took {monotonic() - setpoint_start_time:.1f}s)"
 
-            for dut in app.active_duts:
+            for dut_idx, dut in enumerate(app.active_duts):
                 ch, fs = dut['channel'], dut['fs']
-                mean_dut = np.mean(dut_readings.get(ch, [])) if dut_readings.get(ch) else np.nan
-                app.data_storage[f'Device_{ch+1}_Pressure_Torr'].append(mean_dut)
+                mean_dut = dut_means[ch]
+                app.data_storage[f'Device_{ch+1}_Pressure_Torr'][row] = mean_dut
 
                 if not np.isnan(mean_dut):
                     log_line += f" | Dev {ch+1} (Avg): {mean_dut:.3f} Torr"
-                    if sp in dut_specific_setpoints.get(ch, set()):
+                    if owns_setpoint[sp_idx, dut_idx]:
                         error = mean_dut - mean_standard
                         if sp not in app.error_plot_data: app.error_plot_data[sp] = {}
                         app.error_plot_data[sp][ch] = {'error': error, 'time': time.time() - app.start_time}
@@ -164,28 +200,33 @@ def run_calibration(app):
                 else:
                     log_line += f" | Dev {ch+1}: {'OUT OF RANGE' if sp > fs else 'READ FAILED'}"
 
+            logged_rows += 1
+            csv_writer.writerow(['' if np.isnan(v) else v for v in (app.data_storage[col][row].item() for col in storage_columns)])
+            csv_file.flush()
             app.log_message(log_line)
             app.after(0, app.update_error_plot)
 
+        app.data_storage = {col: values[:logged_rows] for col, values in app.data_storage.items()}
+
         if app.is_calibrating:
             app.log_message("\n--- Data Logging Complete. Analyzing results for certificate generation... ---")
             
-            output_dir = "Analysis"
-            os.makedirs(output_dir, exist_ok=True)
-            csv_output_path = os.path.join(output_dir, "calibration_results.csv")
-            
-            cal_results_df = pd.DataFrame(app.data_storage)
-            cal_results_df.to_csv(csv_output_path, index=False)
+            csv_file.close()
+            os.replace(csv_partial_path, csv_output_path)
             app.log_message(f"Data saved to '{csv_output_path}'.")
             app._save_learned_data()
 
             tech_id = app.tech_id_var.get()
+            cal_results_df = None # Only the certificate generator needs a DataFrame
+            std_raw = np.asarray(app.data_storage['Standard_Pressure_Torr'], dtype=float)
+            std_valid = ~np.isnan(std_raw)
 
             for dut in app.active_duts:
                 app.log_message(f"Checking pass status for DUT {dut['channel']+1}...")
                 
-                std_points = np.array([s for s, d in zip(cal_results_df['Standard_Pressure_Torr'], cal_results_df[f'Device_{dut["channel"]+1}_Pressure_Torr']) if not np.isnan(d) and not np.isnan(s)])
-                dut_points = np.array([d for s, d in zip(cal_results_df['Standard_Pressure_Torr'], cal_results_df[f'Device_{dut["channel"]+1}_Pressure_Torr']) if not np.isnan(d) and not np.isnan(s)])
+                dut_raw = np.asarray(app.data_storage[f'Device_{dut["channel"]+1}_Pressure_Torr'], dtype=float)
+                valid = std_valid & ~np.isnan(dut_raw)
+                std_points, dut_points = std_raw[valid], dut_raw[valid]
                 
                 is_pass = False
                 if len(dut_points) > 3:
@@ -197,6 +238,7 @@ def run_calibration(app):
 
                 if is_pass:
                     app.log_message(f"✅ DUT {dut['channel']+1} PASSED. Generating certificate for WIP {dut['wip']}...")
+                    if cal_results_df is None: cal_results_df = pd.DataFrame(app.data_storage)
                     cert_path = generate_certificate(dut, cal_results_df, tech_id, app.log_queue)
                     if cert_path:
                         app.generated_certs.append(cert_path)
@@ -206,6 +248,9 @@ def run_calibration(app):
     except Exception as e:
         app.log_message(f"FATAL ERROR during logging: {e}")
     finally:
+        if csv_file is not None: csv_file.close()
+        if logged_rows is not None: # Trim the unused slots if the loop was cut short
+            app.data_storage = {col: values[:logged_rows] for col, values in app.data_storage.items()}
         if app.is_calibrating: app.after(0, app._generate_debug_plot)
         app.is_calibrating = False
         if app.state_controller: app.state_controller.close_valves()
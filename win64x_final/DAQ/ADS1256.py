@@ -157,8 +157,9 @@ class ADS1256:
         self.ADS1256_ConfigADC(ADS1256_GAIN_E['ADS1256_GAIN_1'], ADS1256_DRATE_E['ADS1256_30000SPS'])
         return 0
         
-    def ADS1256_Read_ADC_Data(self):
-        self.ADS1256_WaitDRDY()
+    def ADS1256_Read_ADC_Data(self, wait=True):
+        if wait: # Pass wait=False only when DRDY was already seen low for the pending result
+            self.ADS1256_WaitDRDY()
         config.digital_write(self.cs_pin, GPIO.LOW)
         config.spi_writebyte([CMD['CMD_RDATA']])
         
@@ -204,3 +205,32 @@ class ADS1256:
         for i in range(num_channels):
             ADC_Value[i] = self.ADS1256_GetChannalValue(i)
         return ADC_Value
+
+    def ADS1256_ScanAll(self):
+        """
+        Same result as ADS1256_GetAll, but pipelined per the datasheet's multiplexer-cycling
+        sequence: once channel i's conversion is ready, the MUX is switched and channel i+1's
+        conversion started before channel i's result is read out, so SPI readout overlaps
+        the next conversion instead of waiting on it.
+        """
+        global ScanMode
+        if(ScanMode == 1): # Differential mode
+            num_channels = 4
+            set_mux = self.ADS1256_SetDiffChannal
+        else: # Single-ended mode
+            num_channels = 8
+            set_mux = self.ADS1256_SetChannal
+        ADC_Value = [0]*num_channels
+
+        set_mux(0)
+        self.ADS1256_WriteCmd(CMD['CMD_SYNC'])
+        self.ADS1256_WriteCmd(CMD['CMD_WAKEUP'])
+        for i in range(num_channels):
+            self.ADS1256_WaitDRDY()
+            if i + 1 < num_channels:
+                set_mux(i + 1)
+                self.ADS1256_WriteCmd(CMD['CMD_SYNC'])
+                self.ADS1256_WriteCmd(CMD['CMD_WAKEUP'])
+            # The output register still holds channel i until channel i+1 completes
+            ADC_Value[i] = self.ADS1256_Read_ADC_Data(wait=False)
+        return ADC_Value
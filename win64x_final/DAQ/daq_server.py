@@ -60,17 +60,22 @@ def main():
                 with conn:
                     print(f"Connected by {addr}")
                     conn.setblocking(False)
-                    buffer = ""
+                    pending = [] # Received chunks of a command line not yet terminated by '\n'
                     
                     while True:
                         # 1. Check for incoming commands
                         try:
-                            data = conn.recv(1024).decode('utf-8')
+                            data = conn.recv(1024)
                             if not data: break
-                            buffer += data
-                            while '\n' in buffer:
-                                command, buffer = buffer.split('\n', 1)
-                                if command: handle_command(command, multiplexer)
+                            if b'\n' in data:
+                                # Join only once a line is complete; a partial tail stays pending
+                                pending.append(data)
+                                commands = b''.join(pending).split(b'\n')
+                                pending = [commands.pop()]
+                                for command in commands:
+                                    if command: handle_command(command.decode('utf-8'), multiplexer)
+                            else:
+                                pending.append(data)
                         except BlockingIOError:
                             pass # No data received, continue to send data
                         except (socket.error, BrokenPipeError):
@@ -78,7 +83,7 @@ def main():
                             break
 
                         # 2. Read and send ADC data
-                        adc_values = ADC.ADS1256_GetAll()
+                        adc_values = ADC.ADS1256_ScanAll()
                         voltages = [val * 5.0 / 0x7fffff for val in adc_values]
                         
                         data_string = ",".join(map(str, voltages)) + "\n"
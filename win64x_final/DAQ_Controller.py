@@ -1,8 +1,8 @@
 # DAQ_Controller.py
 import socket
+import selectors
 import time
 import threading
-import collections
 import numpy as np
 
 try:
@@ -40,13 +40,26 @@ class DAQController:
             self.is_connected = False
             self._stop_event = threading.Event()
             self._polling_thread = None
-            self.data_lock = threading.Lock()
-            self.voltage_histories = [collections.deque(maxlen=5) for _ in range(4)]
+            self._selector = None
+            # 5-sample box filter: one column of the (4, 5) ring per sample plus running sums, so a
+            # new sample is a single column update instead of re-averaging every channel's history.
+            self._filter_len = 5
+            self._voltage_ring = np.zeros((4, self._filter_len))
+            self._voltage_sums = np.zeros(4)
+            self._ring_head = 0
+            self._ring_count = 0
+            # The ring and sums belong to the listener thread alone. Readers only ever see this
+            # immutable tuple, which the listener replaces wholesale (a single reference swap),
+            # so neither side needs a lock. Keep it single-writer if this changes.
+            self._filtered_voltages = None
 
             try:
                 self.sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
                 self.sock.settimeout(5)
                 self.sock.connect((self.host, self.port))
+                # The listener waits on the selector in short slices so it notices _stop_event promptly
+                self._selector = selectors.DefaultSelector()
+                self._selector.register(self.sock, selectors.EVENT_READ)
                 self.is_connected = True
                 self._polling_thread = threading.Thread(target=self._data_listener_thread, daemon=True)
                 self._polling_thread.start()
@@ -54,27 +67,43 @@ class DAQController:
                 raise ConnectionError(f"Failed to connect to DAQ at {self.host}:{self.port} - {e}")
 
     def _data_listener_thread(self):
-        buffer = ""
+        # Bytes are received straight into a fixed buffer. Each wakeup parses every complete
+        # line at once and moves the trailing partial line back to the front.
+        rxbuf = bytearray(65536)
+        rxview = memoryview(rxbuf)
+        rxlen = 0
         while not self._stop_event.is_set():
             try:
-                data = self.sock.recv(1024).decode('utf-8')
-                if not data:
+                if not self._selector.select(timeout=0.1):
+                    continue
+                if rxlen == len(rxbuf):
+                    self.log_queue.put("DAQ WARNING: Receive buffer full without a line break. Discarding.")
+                    rxlen = 0
+                n = self.sock.recv_into(rxview[rxlen:])
+                if not n:
                     self.is_connected = False
                     self.log_queue.put("DAQ WARNING: Connection to Pi lost.")
                     break
 
-                buffer += data
-                while '\n' in buffer:
-                    line, buffer = buffer.split('\n', 1)
-                    if line.strip():
-                        try:
-                            raw_voltages = [float(v) for v in line.strip().split(',') if v]
-                            if len(raw_voltages) == 4:
-                                with self.data_lock:
-                                    for i, voltage in enumerate(raw_voltages):
-                                        self.voltage_histories[i].append(voltage)
-                        except (ValueError, IndexError):
-                            self.log_queue.put(f"DAQ WARNING: Received malformed data: {line}")
+                rxlen += n
+                end = rxbuf.rfind(b'\n', 0, rxlen)
+                if end < 0:
+                    continue
+                lines = rxbuf[:end].split(b'\n')
+                remainder = rxlen - end - 1
+                rxbuf[:remainder] = rxbuf[end + 1:rxlen]
+                rxlen = remainder
+
+                for line in lines:
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        raw_voltages = np.array([float(v) for v in line.split(b',') if v]) # float() parses bytes directly
+                        if raw_voltages.size == 4:
+                            self._push_voltages(raw_voltages)
+                    except (ValueError, IndexError):
+                        self.log_queue.put(f"DAQ WARNING: Received malformed data: {line.decode('utf-8', 'replace')}")
             except (ConnectionResetError, BrokenPipeError):
                 self.is_connected = False
                 self.log_queue.put("DAQ WARNING: Connection to Pi was forcibly closed.")
@@ -84,18 +113,39 @@ class DAQController:
                 self.log_queue.put("DAQ WARNING: Socket error. Disconnecting.")
                 break
 
+    def _push_voltages(self, raw_voltages):
+        """Adds one 4-channel sample (array) to the box filter and publishes the new averages. Listener thread only."""
+        column = self._voltage_ring[:, self._ring_head]
+        self._voltage_sums += raw_voltages - column
+        column[:] = raw_voltages
+        self._ring_head += 1
+        if self._ring_head == self._filter_len:
+            self._ring_head = 0
+            # Re-sum once per lap so floating-point error can't accumulate over a long run
+            self._voltage_ring.sum(axis=1, out=self._voltage_sums)
+        if self._ring_count < self._filter_len:
+            self._ring_count += 1
+        self._filtered_voltages = tuple((self._voltage_sums / self._ring_count).tolist())
+
+    def read_all_voltages(self):
+        """Returns all four channel voltages from one scan (Pi) or one filter snapshot (network), or None if disconnected."""
+        if IS_PI:
+            return [value * 5.0 / 0x7fffff for value in self.ADC.ADS1256_ScanAll()]
+        if not self.is_connected:
+            return None
+        voltages = self._filtered_voltages
+        return voltages if voltages is not None else (0.0,) * 4
+
     def read_voltage(self, channel):
         if IS_PI:
-            adc_values = self.ADC.ADS1256_GetAll()
-            return adc_values[channel] * 5.0 / 0x7fffff
+            return self.ADC.ADS1256_GetChannalValue(channel) * 5.0 / 0x7fffff
         else:
             if not self.is_connected:
                 return None
-            with self.data_lock:
-                history = self.voltage_histories[channel]
-                if not history:
-                    return 0.0
-                return np.mean(history)
+            voltages = self._filtered_voltages
+            if voltages is None:
+                return 0.0
+            return voltages[channel]
 
     def select_channel(self, channel):
         if IS_PI:
@@ -128,6 +178,8 @@ class DAQController:
             self._stop_event.set()
             if self._polling_thread is not None:
                 self._polling_thread.join(timeout=1)
+            if self._selector is not None:
+                self._selector.close()
             if self.is_connected and self.sock:
                 try:
                     self.sock.shutdown(socket.SHUT_RDWR)
@@ -96,6 +96,7 @@ class CalibrationGUI(tk.Tk):
         self.live_time_history = collections.deque(maxlen=500)
         self.live_std_pressure_history = collections.deque(maxlen=500)
         self.live_dut_pressure_history = {i: collections.deque(maxlen=500) for i in range(4)}
+        self.live_sample_count = 0 # Rows appended to the live histories so far; lets readers mark a window
 
         self.live_std_plot = None
         self.live_dut_plots = {}
@@ -1007,10 +1008,12 @@ class CalibrationGUI(tk.Tk):
                 with self.active_duts_lock:
                     local_active_duts = self.active_duts[:]
 
+                # One DAQ scan per update covers every channel, rather than one scan per channel
+                daq_voltages = self.daq.read_all_voltages() if self.daq and local_active_duts else None
                 for i in range(4):
                     dut_pressure = np.nan
                     if any(d['channel'] == i for d in local_active_duts):
-                        voltage_from_daq = self.daq.read_voltage(i) if self.daq else None
+                        voltage_from_daq = daq_voltages[i] if daq_voltages is not None else None
                         if voltage_from_daq is not None:
                             fs_list = [d['fs'] for d in local_active_duts if d['channel'] == i]
                             if fs_list:
@@ -1025,6 +1028,7 @@ class CalibrationGUI(tk.Tk):
                         self.manual_trace_duts[i].append(dut_pressure)
                     if self.is_calibrating:
                         self.debug_full_dut_pressure[i].append(dut_pressure)
+                self.live_sample_count += 1
 
                 if not self.is_in_manual_mode and self.live_std_plot:
                     if len(self.live_time_history) == len(self.live_std_pressure_history):
@@ -248,7 +248,7 @@ class ManualCalFrame(tk.Frame):
                 if current_pressure is None: continue
 
                 # Define stability criteria
-                is_stable = statistics.stdev(history) < (self.main_app.standard_fs_value * 0.0003)
+                is_stable = self.state_controller.pressure_stdev < (self.main_app.standard_fs_value * 0.0003)
                 is_on_target = abs(current_pressure - self.manual_learn_target) < (self.main_app.standard_fs_value * 0.0015)
                 is_stable_now = is_stable and is_on_target
 
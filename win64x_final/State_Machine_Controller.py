@@ -40,10 +40,15 @@ class StateMachinePressureController:
 
         self.inlet_lock = threading.Lock()
         self.outlet_lock = threading.Lock()
+        self._history_lock = threading.Lock() # Serialises pressure_history recording against clearing
 
         self.hold_all_valves = threading.Event()
         self.manual_override_active = threading.Event() # <-- NEW for manual cooldown
 
+        # Notified on every new pressure sample; sample_counter lets waiters tell new data from a timeout.
+        self.pressure_cv = threading.Condition()
+        self.sample_counter = 0
+
         try:
             self.ser_inlet = serial.Serial(port=inlet_port, baudrate=9600, timeout=1, write_timeout=1)
             self.ser_outlet = serial.Serial(port=outlet_port, baudrate=9600, timeout=1, write_timeout=1)
@@ -65,6 +70,9 @@ class StateMachinePressureController:
             self.system_setpoint = 0.0
             self.previous_setpoint = 0.0
             self.pressure_history = collections.deque(maxlen=10)
+            # Running (shift, n, sum, sum of squares) of pressure_history, shifted by the window's
+            # first sample to avoid cancellation. Published as one tuple for the reader threads.
+            self._p_moments = (0.0, 0, 0.0, 0.0)
             self.is_connected = True
             self.current_pressure, self.inlet_valve_pos, self.outlet_valve_pos = None, 0.0, 0.0
             self.inlet_pos_history = collections.deque(maxlen=10)
@@ -170,10 +178,52 @@ class StateMachinePressureController:
             pressure = self.get_pressure()
             if pressure is not None:
                 self.current_pressure = pressure
-                self.pressure_history.append(self.current_pressure)
+                self._record_pressure(pressure)
+                with self.pressure_cv:
+                    self.sample_counter += 1
+                    self.pressure_cv.notify_all()
             self.get_valve_positions()
             time.sleep(0.2)
 
+    def _record_pressure(self, pressure):
+        with self._history_lock:
+            history = self.pressure_history
+            if not history: # Fresh window (set_pressure clears it): restart the sums
+                shift, p_sum, p_sqsum = pressure, 0.0, 0.0
+            else:
+                shift, _, p_sum, p_sqsum = self._p_moments
+                if len(history) == history.maxlen:
+                    evicted = history[0] - shift
+                    p_sum -= evicted; p_sqsum -= evicted * evicted
+            history.append(pressure)
+            d = pressure - shift
+            self._p_moments = (shift, len(history), p_sum + d, p_sqsum + d * d)
+
+    def _clear_pressure_history(self):
+        with self._history_lock:
+            self.pressure_history.clear()
+            self._p_moments = (0.0, 0, 0.0, 0.0)
+
+    @property
+    def pressure_mean(self):
+        """Mean of pressure_history in O(1); same result and errors as statistics.mean."""
+        shift, n, p_sum, _ = self._p_moments
+        if n < 1: raise statistics.StatisticsError("mean requires at least one data point")
+        return shift + p_sum / n
+
+    @property
+    def pressure_stdev(self):
+        """Sample standard deviation of pressure_history in O(1); same result and errors as statistics.stdev."""
+        _, n, p_sum, p_sqsum = self._p_moments
+        if n < 2: raise statistics.StatisticsError("stdev requires at least two data points")
+        return (max(p_sqsum - p_sum * p_sum / n, 0.0) / (n - 1)) ** 0.5
+
+    def wait_for_sample(self, last_seen, timeout):
+        """Blocks until sample_counter moves past last_seen or timeout expires. Returns the counter."""
+        with self.pressure_cv:
+            self.pressure_cv.wait_for(lambda: self.sample_counter != last_seen, timeout)
+            return self.sample_counter
+
     def _run_adaptive_outlet_loop(self):
         while not self._stop_event.is_set() and not self.e_stop_event.is_set():
             # --- NEW: Check for manual override cooldown ---
@@ -200,12 +250,12 @@ class StateMachinePressureController:
                 new_outlet_pos = current_outlet_pos
                 log_reason = "Holding"
 
-                mean_pressure = statistics.mean(self.pressure_history)
+                mean_pressure = self.pressure_mean
                 is_near_setpoint = abs(mean_pressure - self.system_setpoint) < (self.full_scale_pressure * 0.02)
 
                 if is_near_setpoint and not self.inlet_high_blind_active:
                     pressure_oscillation_threshold = (self.system_setpoint * 0.003) + (self.full_scale_pressure * 0.0008)
-                    pressure_std_dev = statistics.stdev(self.pressure_history)
+                    pressure_std_dev = self.pressure_stdev
                     if pressure_std_dev > pressure_oscillation_threshold:
                         self.oscillation_counter = min(self.oscillation_counter + 1, 5)
                         self.oscillation_cooldown = True
@@ -236,7 +286,7 @@ class StateMachinePressureController:
                         log_reason = f"EMERGENCY DESCENT (Err: {error:+.1f})"
                     else:
                         new_outlet_pos = current_outlet_pos - 0.2
-                        log_reason = f"Pressure oscillating (StdDev: {statistics.stdev(self.pressure_history):.3f} Torr)"
+                        log_reason = f"Pressure oscillating (StdDev: {self.pressure_stdev:.3f} Torr)"
                     self.oscillation_counter = 0
                 
                 elif self.inlet_oscillation_counter >= 3:
@@ -250,7 +300,7 @@ class StateMachinePressureController:
 
                 else:
                     step_size = 0.5
-                    is_pressure_stable = statistics.stdev(self.pressure_history) < (0.005 + (self.system_setpoint * 0.001))
+                    is_pressure_stable = self.pressure_stdev < (0.005 + (self.system_setpoint * 0.001))
 
                     if is_pressure_stable and error > 0.2 and not self.inlet_high_blind_active and not self.oscillation_cooldown:
                         new_outlet_pos = current_outlet_pos + step_size
@@ -327,7 +377,7 @@ class StateMachinePressureController:
         self.log_queue.put(f">> New system setpoint: {pressure:.3f} Torr")
         self.previous_setpoint = self.system_setpoint
         self.system_setpoint = pressure
-        self.pressure_history.clear()
+        self._clear_pressure_history()
         self.last_log_reason = ""
         self.max_slope_hold = False
         self.oscillation_cooldown = False
@@ -13,13 +13,16 @@ def generate_tuning_suggestions(data_storage, active_duts):
     
     output_dir = "Analysis"
     os.makedirs(output_dir, exist_ok=True)
+    std_raw = np.asarray(data_storage['Standard_Pressure_Torr'], dtype=float)
+    std_valid = ~np.isnan(std_raw)
 
     for dut in active_duts:
         ch, fs = dut['channel'], dut['fs']
         suggestion_parts = []
         
-        std_points = np.array([s for s, d in zip(data_storage['Standard_Pressure_Torr'], data_storage[f'Device_{ch+1}_Pressure_Torr']) if not np.isnan(d) and not np.isnan(s)])
-        dut_points = np.array([d for s, d in zip(data_storage['Standard_Pressure_Torr'], data_storage[f'Device_{ch+1}_Pressure_Torr']) if not np.isnan(d) and not np.isnan(s)])
+        dut_raw = np.asarray(data_storage[f'Device_{ch+1}_Pressure_Torr'], dtype=float)
+        valid = std_valid & ~np.isnan(dut_raw)
+        std_points, dut_points = std_raw[valid], dut_raw[valid]
         
         if len(dut_points) < 3:
             dut_pass_status[ch] = False
@@ -31,14 +34,12 @@ def generate_tuning_suggestions(data_storage, active_duts):
         zero_offset_is_sig = abs(intercept) > (fs * 0.001)
         span_error_is_sig = abs(1.0 - slope) > 0.005
         
-        non_linearity_points = [dut_p - (slope * std_p + intercept) for std_p, dut_p in zip(std_points, dut_points)]
-        linearity_is_sig = False
-        midpoint_error_from_line = 0
-        if non_linearity_points:
-            max_non_linearity = max(np.abs(non_linearity_points))
-            linearity_is_sig = max_non_linearity > (fs * 0.002)
-            if linearity_is_sig:
-                 midpoint_error_from_line = non_linearity_points[np.abs(non_linearity_points).argmax()]
+        # Residuals from the fitted line; there are at least 3 points here, so argmax is safe.
+        non_linearity_points = dut_points - (slope * std_points + intercept)
+        abs_non_linearity = np.abs(non_linearity_points)
+        worst_idx = abs_non_linearity.argmax()
+        linearity_is_sig = abs_non_linearity[worst_idx] > (fs * 0.002)
+        midpoint_error_from_line = non_linearity_points[worst_idx] if linearity_is_sig else 0
 
         plot_filename = os.path.join(output_dir, f"DUT_{ch+1}_tuning_curve.png")
         generate_curve_plot(std_points, dut_points, slope, intercept, fs, ch, plot_filename)